@@ -0,0 +1,146 @@
+"""Construction cost benchmark for TextBox, TextArea and ToggleIconButton.
+
+Counts every property assignment made while constructing each component,
+including assignments whose setter is skipped because the value is unchanged,
+and compares the current single pass against the old constructors, which ran
+init_components a second time and then re-assigned their properties by hand.
+
+This isn't shipped with the theme. To run it, copy it into a client module of an
+app that uses the theme as a dependency and call run() from a form, e.g. in a
+button click handler. The results are printed to the app's output panel.
+"""
+
+import sys
+import time
+
+from m3.components import TextArea, TextBox, ToggleIconButton
+
+COUNT = 100
+
+# The properties the old constructors re-assigned after their second
+# init_components call.
+BASELINE_REASSIGNED = {
+  TextBox: (
+    "display_italic",
+    "display_bold",
+    "display_underline",
+    "display_font_size",
+    "display_font_family",
+    "display_text_color",
+    "background_color",
+    "leading_icon_color",
+    "trailing_icon_color",
+    "placeholder",
+    "text",
+    "label",
+    "enabled",
+    "error",
+    "leading_icon",
+    "character_limit",
+    "type",
+    "hide_text",
+  ),
+  TextArea: (
+    "display_italic",
+    "display_bold",
+    "display_underline",
+    "display_font_size",
+    "display_font",
+    "display_text_color",
+    "background_color",
+    "align",
+    "placeholder",
+    "label",
+    "text",
+    "enabled",
+    "height",
+    "character_limit",
+  ),
+  ToggleIconButton: (
+    "border",
+    "icon_color",
+    "background_color",
+    "selected_border",
+    "selected_background_color",
+    "selected_icon_color",
+    "selected",
+  ),
+}
+
+
+class _CountingDescriptor:
+  def __init__(self, descriptor, counts):
+    self._descriptor = descriptor
+    self._counts = counts
+
+  def __get__(self, obj, objtype=None):
+    if obj is None:
+      return self
+    return self._descriptor.__get__(obj, objtype)
+
+  def __set__(self, obj, value):
+    self._counts[0] += 1
+    self._descriptor.__set__(obj, value)
+
+
+def _count_sets(cls, counts):
+  """Wraps every settable descriptor cls has (or inherits) so that assignments
+  are counted. Returns a function that undoes the wrapping."""
+  originals = {}
+  for klass in cls.__mro__:
+    for name, value in vars(klass).items():
+      if name in originals or not hasattr(type(value), "__set__"):
+        continue
+      originals[name] = cls.__dict__.get(name)
+      setattr(cls, name, _CountingDescriptor(value, counts))
+
+  def restore():
+    for name, value in originals.items():
+      if value is None:
+        delattr(cls, name)
+      else:
+        setattr(cls, name, value)
+
+  return restore
+
+
+def _construct_current(cls):
+  cls()
+
+
+def _construct_baseline(cls):
+  # the old constructors didn't call init_unset_properties
+  module = sys.modules[cls.__module__]
+  init_unset_properties = module.init_unset_properties
+  module.init_unset_properties = lambda *args: None
+  try:
+    component = cls()
+    component.init_components()
+    for name in BASELINE_REASSIGNED[cls]:
+      setattr(component, name, getattr(component, name))
+  finally:
+    module.init_unset_properties = init_unset_properties
+
+
+def _measure(cls, construct):
+  counts = [0]
+  restore = _count_sets(cls, counts)
+  try:
+    start = time.time()
+    for _ in range(COUNT):
+      construct(cls)
+    elapsed = time.time() - start
+  finally:
+    restore()
+  return counts[0] / COUNT, 1000 * elapsed / COUNT
+
+
+def run():
+  print(f"{'component':<18}{'':>10}{'sets':>8}{'ms':>8}")
+  for cls in (TextBox, TextArea, ToggleIconButton):
+    for label, construct in (
+      ("baseline", _construct_baseline),
+      ("current", _construct_current),
+    ):
+      sets, ms = _measure(cls, construct)
+      print(f"{cls.__name__:<18}{label:>10}{sets:>8.1f}{ms:>8.2f}")
@@ -1,12 +1,15 @@
 from anvil.designer import in_designer, register_interaction
 from anvil.js import window
 
+from ..._utils import noop
+from ..._utils.navigation import NavigationGroup
 from ..._utils.properties import (
   anvil_prop,
   color_property,
   padding_property,
   theme_color_to_css,
 )
+from ..._utils.scroll_sentinel import track_scrolled
 from ._anvil_designer import NavigationDrawerLayoutTemplate
 
 
@@ -23,6 +26,9 @@ class NavigationDrawerLayout(NavigationDrawerLayoutTemplate):
     self.sidesheet = self.dom_nodes['anvil-m3-sidesheet']
     self.content = self.dom_nodes['anvil-m3-content']
     self.sidesheet_previous_state = False
+    self._stop_scroll_tracking = noop
+    # tracks the selected NavigationLink in the navigation slot
+    self._navigation_group = NavigationGroup()
     self.init_components(**properties)
 
     if in_designer:
@@ -35,7 +41,8 @@ class NavigationDrawerLayout(NavigationDrawerLayoutTemplate):
     self.add_event_handler('x-anvil-page-removed', self._on_page_removed)
 
   def _on_page_added(self, **event_args):
-    window.document.addEventListener('scroll', self._on_scroll)
+    self._stop_scroll_tracking()
+    self._stop_scroll_tracking = track_scrolled(self.app_bar)
 
     if in_designer:
       # interactions are for when we are not the main form
@@ -47,7 +54,8 @@ class NavigationDrawerLayout(NavigationDrawerLayoutTemplate):
       )
 
   def _on_page_removed(self, **event_args):
-    window.document.removeEventListener('scroll', self._on_scroll)
+    self._stop_scroll_tracking()
+    self._stop_scroll_tracking = noop
 
   def _anvil_get_interactions_(self):
     return [
@@ -85,12 +93,6 @@ class NavigationDrawerLayout(NavigationDrawerLayoutTemplate):
 
     animation.addEventListener('finish', on_finished)
 
-  def _on_scroll(self, e):
-    if window.scrollY == 0:
-      self.app_bar.classList.remove('anvil-m3-scrolled')
-    else:
-      self.app_bar.classList.add('anvil-m3-scrolled')
-
   def _open_sidesheet(self):
     if self.sidesheet_previous_state:
       self.sidesheet.classList.add('anvil-m3-display-block')
@@ -1,12 +1,15 @@
 from anvil import *
 from anvil.js import window
 
+from ..._utils import noop
+from ..._utils.navigation import NavigationGroup
 from ..._utils.properties import (
   anvil_prop,
   color_property,
   padding_property,
   theme_color_to_css,
 )
+from ..._utils.scroll_sentinel import track_scrolled
 from ._anvil_designer import NavigationRailLayoutTemplate
 
 
@@ -24,11 +27,23 @@ class NavigationRailLayout(NavigationRailLayoutTemplate):
     self.sidesheet_previous_state = False
     self.zero_width_timeout = None
     self.shown_timeout = None
+    self._stop_scroll_tracking = noop
+    # tracks the selected NavigationLink in the navigation slot
+    self._navigation_group = NavigationGroup()
     self.init_components(**properties)
 
-    window.document.addEventListener('scroll', self._add_scroll_class)
     self.nav_drawer_open_btn.addEventListener('click', self.open_nav_drawer)
     self.nav_drawer_scrim.addEventListener('click', self.hide_nav_drawer)
+    self.add_event_handler('x-anvil-page-added', self._on_page_added)
+    self.add_event_handler('x-anvil-page-removed', self._on_page_removed)
+
+  def _on_page_added(self, **event_args):
+    self._stop_scroll_tracking()
+    self._stop_scroll_tracking = track_scrolled(self.app_bar)
+
+  def _on_page_removed(self, **event_args):
+    self._stop_scroll_tracking()
+    self._stop_scroll_tracking = noop
 
   #!defMethod(_)!2: "Open the navigation drawer." ["open_nav_drawer"]
   def open_nav_drawer(self, e):
@@ -58,13 +73,6 @@ class NavigationRailLayout(NavigationRailLayoutTemplate):
   def add_to_nav_rail(self, component):
     self.slots['nav_rail_slot'].add_component(component)
 
-  def _add_scroll_class(self, e):
-    if self.app_bar.classList.contains('anvil-m3-scrolled'):
-      if window.scrollY == 0:
-        self.app_bar.classList.remove('anvil-m3-scrolled')
-    else:
-      self.app_bar.classList.add('anvil-m3-scrolled')
-
   def _open_sidesheet(self):
     if self.sidesheet_previous_state:
       self.sidesheet.classList.add('anvil-m3-display-block')
@@ -4,7 +4,7 @@ from anvil import HtmlTemplate
 from anvil.js import get_dom_node
 from anvil.js.window import document
 
-from ..._utils import fui, noop
+from ..._utils import event_hub, fui
 from ..._utils.properties import (
   ComponentTag,
   anvil_prop,
@@ -22,46 +22,91 @@ class ButtonMenu(ButtonMenuTemplate):
     self.tag = ComponentTag()
     self._props = properties
     self._design_name = ""
-    self._cleanup = noop
+    self._floating = None
     self._menuNode = self.dom_nodes['anvil-m3-buttonMenu-items-container']
     self._btnNode = get_dom_node(self.menu_button).querySelector("button")
     self._open = False
     self._hoverIndex = None
-    self._itemIndices = set()
-    self._children = None
+    # the MenuItems that keyboard navigation moves between, built on demand
+    self._nav_items = None
     self._shown = False
+    self._menu_attached = False
 
     self.init_components(**properties)
 
     self.add_event_handler("x-anvil-page-added", self._on_mount)
     self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
+  def add_component(self, component, **layout_props):
+    self._invalidate_nav_index()
+    return super().add_component(component, **layout_props)
+
+  def clear(self, *args, **kwargs):
+    self._invalidate_nav_index()
+    return super().clear(*args, **kwargs)
+
+  def _get_nav_items(self):
+    if self._nav_items is None:
+      self._nav_items = [
+        child for child in self.get_components() if isinstance(child, MenuItem)
+      ]
+      # a removed item also leaves the page, which tells us to rebuild
+      for item in self._nav_items:
+        item.add_event_handler("x-anvil-page-removed", self._invalidate_nav_index)
+    return self._nav_items
+
+  def _invalidate_nav_index(self, **event_args):
+    items = self._nav_items
+    if items is None:
+      return
+    self._set_hover(None)
+    self._nav_items = None
+    for item in items:
+      item.remove_event_handler("x-anvil-page-removed", self._invalidate_nav_index)
+
+  def _is_lazy(self):
+    return self.lazy and not anvil.designer.in_designer
+
   def _setup_fui(self):
-    if self._shown:
-      self._cleanup()
-      self._cleanup = fui.auto_update(
+    if not self._shown or (self._is_lazy() and not self._open):
+      return
+    self._attach_menu()
+    if self._floating is None:
+      self._floating = fui.register(
         self._btnNode, self._menuNode, placement="bottom-start"
       )
+    # the menu is only positioned while it's open
+    if self._open and self._floating.is_open:
+      self._floating.update()
+    elif self._open:
+      self._floating.open()
+
+  def _stop_fui(self):
+    if self._floating is not None:
+      self._floating.close()
+
+  def _attach_menu(self):
+    if not self._menu_attached:
+      # We still have a reference to the dom node but we've moved it to the body
+      # This gets around the fact that Anvil containers set their overflow to hidden
+      document.body.append(self._menuNode)
+      self._menu_attached = True
 
   def _on_mount(self, **event_args):
     self._shown = True
-    document.addEventListener('keydown', self._handle_keyboard_events)
     self._menuNode.addEventListener('click', self._child_clicked)
     self._btnNode.addEventListener('click', self._handle_click)
-    document.addEventListener('click', self._body_click)
-    # We still have a reference to the dom node but we've moved it to the body
-    # This gets around the fact that Anvil containers set their overflow to hidden
-    document.body.append(self._menuNode)
+    # lazy menus are moved to the body and positioned when they're first opened
     self._setup_fui()
 
   def _on_cleanup(self, **event_args):
     self._shown = False
-    document.removeEventListener('keydown', self._handle_keyboard_events)
+    event_hub.deactivate(self)
     self._menuNode.removeEventListener('click', self._child_clicked)
-    document.removeEventListener('click', self._body_click)
-    self._cleanup()
+    self._stop_fui()
     # Remove the menu node we put on the body
     self._menuNode.remove()
+    self._menu_attached = False
 
   def _anvil_get_unset_property_values_(self):
     el = self.menu_button.dom_nodes["anvil-m3-button"]
@@ -196,6 +241,10 @@ class ButtonMenu(ButtonMenuTemplate):
   def role(self, value):
     self.menu_button.role = value
 
+  @anvil_prop
+  def lazy(self, value):
+    self._setup_fui()
+
   @anvil_prop
   def menu_items(self, value=[]):
     for i in value:
@@ -213,10 +262,15 @@ class ButtonMenu(ButtonMenuTemplate):
 
     self._open = not classes.contains('anvil-m3-buttonMenu-items-hidden')
     if self._open:
-      self._get_hover_index_information()
+      self._setup_fui()
+      if self._shown:
+        event_hub.activate(
+          self, {'keydown': self._handle_keyboard_events, 'click': self._body_click}
+        )
     else:
-      self._hoverIndex = None
-      self._clear_hover_styles()
+      self._set_hover(None)
+      event_hub.deactivate(self)
+      self._stop_fui()
 
   def _child_clicked(self, event):
     # do the click action. The child should handle this
@@ -238,12 +292,6 @@ class ButtonMenu(ButtonMenuTemplate):
       return
     self._toggle_visibility(False)
 
-  def _get_hover_index_information(self):
-    self._children = self.get_components()[:-1]
-    for i in range(0, len(self._children)):
-      if isinstance(self._children[i], MenuItem):
-        self._itemIndices.add(i)
-
   def _handle_keyboard_events(self, event):
     if not self._open:
       return
@@ -254,15 +302,16 @@ class ButtonMenu(ButtonMenuTemplate):
       self._iterate_hover(event.key == "ArrowDown")
       event.preventDefault()
       return
-    hover = (
-      self._hoverIndex
-    )  # holding value for situations like alerts, where it awaits
+    # holding the item for situations like alerts, where it awaits
+    hover = None
+    if self._hoverIndex is not None:
+      hover = self._get_nav_items()[self._hoverIndex]
     self._toggle_visibility(False)
 
     def attemptSelect():
       event.preventDefault()
-      if hover is not None:
-        self._children[hover].raise_event(
+      if hover is not None and hover.parent is self:
+        hover.raise_event(
           "click",
           event=event,
           keys={
@@ -279,38 +328,36 @@ class ButtonMenu(ButtonMenuTemplate):
       attemptSelect()
 
   def _iterate_hover(self, inc=True):
-    if inc:
-      if self._hoverIndex is None or self._hoverIndex is (len(self._children) - 1):
-        self._hoverIndex = -1
-      while True:
-        self._hoverIndex += 1
-        if self._hoverIndex in self._itemIndices:
-          break
+    items = self._get_nav_items()
+    if not items:
+      return
+    index = self._hoverIndex
+    if index is None:
+      index = 0 if inc else len(items) - 1
     else:
-      if self._hoverIndex is None or self._hoverIndex == 0:
-        self._hoverIndex = len(self._children)
-      while True:
-        self._hoverIndex -= 1
-        if self._hoverIndex in self._itemIndices:
-          break
-    self._children[self._hoverIndex].dom_nodes[
-      'anvil-m3-menuItem-container'
-    ].scrollIntoView({'block': 'nearest'})
-    self._update_hover_styles()
-
-  def _clear_hover_styles(self):
-    if self._children is not None:
-      for child in self._children:
-        if isinstance(child, MenuItem):
-          child.dom_nodes['anvil-m3-menuItem-container'].classList.toggle(
-            'anvil-m3-menuItem-container-keyboardHover', False
-          )
+      index = (index + (1 if inc else -1)) % len(items)
+    if items[index].parent is not self:
+      # removed while we weren't on the page, so there was no page-removed event
+      self._invalidate_nav_index()
+      self._iterate_hover(inc)
+      return
+    self._set_hover(index)
+    items[index].dom_nodes['anvil-m3-menuItem-container'].scrollIntoView(
+      {'block': 'nearest'}
+    )
+
+  def _set_hover(self, index):
+    # only the previously hovered item and the new one need their styles changed
+    if self._hoverIndex is not None:
+      self._toggle_hover_style(self._hoverIndex, False)
+    self._hoverIndex = index
+    if index is not None:
+      self._toggle_hover_style(index, True)
 
-  def _update_hover_styles(self):
-    self._clear_hover_styles()
-    self._children[self._hoverIndex].dom_nodes[
+  def _toggle_hover_style(self, index, value):
+    self._get_nav_items()[index].dom_nodes[
       'anvil-m3-menuItem-container'
-    ].classList.toggle('anvil-m3-menuItem-container-keyboardHover', True)
+    ].classList.toggle('anvil-m3-menuItem-container-keyboardHover', value)
 
   def _anvil_get_interactions_(self):
     return [
@@ -368,6 +415,7 @@ class ButtonMenu(ButtonMenuTemplate):
   #!componentProp(m3.ButtonMenu)!1: {name:"button_border",type:"string",description:"The border of the Button. Can take any valid CSS border value."}
   #!componentProp(m3.ButtonMenu)!1: {name:"tooltip",type:"string",description:"The text to display when the mouse is hovered over this component."}
   #!componentProp(m3.ButtonMenu)!1: {name:"icon_position",type:"enum",options:["left", "right"],description:"The alignment of the icon on this component."}
+  #!componentProp(m3.ButtonMenu)!1: {name:"lazy",type:"boolean",description:"If True, the menu is only added to the page when it is first opened, and only tracks its position while it is open."}
   #!componentProp(m3.ButtonMenu)!1: {name:"menu_items",type:"object",description:"A list of components to be added to the menu."}
   #!componentProp(m3.ButtonMenu)!1: {name:"tag",type:"object",description:"Use this property to store any extra data for the component."}
 
@@ -18,7 +18,6 @@ class Card(CardTemplate):
     self.tooltip_node = None
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
     self.init_components(**properties)
 
   def _anvil_get_unset_property_values_(self):
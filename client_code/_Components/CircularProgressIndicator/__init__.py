@@ -1,8 +1,7 @@
-from math import cos, pi, sin
-
 from anvil import *
 from anvil import HtmlTemplate
 
+from ..._utils import in_view, progress
 from ..._utils.properties import (
   anvil_prop,
   get_unset_margin,
@@ -18,10 +17,14 @@ from ._anvil_designer import CircularProgressIndicatorTemplate
 class CircularProgressIndicator(CircularProgressIndicatorTemplate):
   def __init__(self, **properties):
     self.tag = ComponentTag()
-    self._tooltip_node = None
     self._props = properties
+    self._mounted = False
+    self._progress_source = None
     self.init_components(**properties)
 
+    self.add_event_handler("x-anvil-page-added", self._on_mount)
+    self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
+
   def _anvil_get_unset_property_values_(self):
     el = self.dom_nodes["anvil-m3-progressindicator-component"]
     m = get_unset_margin(el, self.margin)
@@ -57,53 +60,35 @@ class CircularProgressIndicator(CircularProgressIndicatorTemplate):
   @anvil_prop
   def progress(self, value):
     v = max(min(value or 0, 100), 0)
-    self._draw_path(v)
-
-  def _draw_path(self, percent):
-    cx, cy = 24, 24  # center of circle
-    rx, ry = 18, 18  # major/minor radius
-    t1 = 3 * pi / 2  # start angle in radians
-    phi = 0  # Rotation on the whole in radians
-
-    radian = pi * percent / 50
-    delta = radian  # Angle to sweep in radians (positive)
-
-    if percent < 100:
-      radian = pi * percent / 50
-      delta = radian  # Angle to sweep in radians (positive)
-      d = self._f_svg_ellipse_arc(cx, cy, rx, ry, t1, delta)
-
-      self.dom_nodes['anvil-m3-progressindicator-arc'].setAttribute("d", d)
-    else:
-      radian = pi * 99 / 50
-      delta = radian  # Angle to sweep in radians (positive)
-      d = self._f_svg_ellipse_arc(cx, cy, rx, ry, t1, delta)
-      self.dom_nodes['anvil-m3-progressindicator-arc'].setAttribute("d", d + " Z")
-
-  def _f_matrix_times(self, matrix, vector):
-    a, b, c, d = matrix[0][0], matrix[0][1], matrix[1][0], matrix[1][1]
-    x, y = vector[0], vector[1]
-    return [a * x + b * y, c * x + d * y]
-
-  def _f_rotate_matrix(self, x):
-    return [[cos(x), -sin(x)], [sin(x), cos(x)]]
-
-  def _f_vec_add(self, vector1, vector2):
-    return [vector1[0] + vector2[0], vector1[1] + vector2[1]]
-
-  def _f_svg_ellipse_arc(self, cx, cy, rx, ry, t1, delta, phi=0):
-    delta = delta % (2 * pi)
-    rotMatrix = self._f_rotate_matrix(phi)
-    sX, sY = self._f_vec_add(
-      self._f_matrix_times(rotMatrix, [rx * cos(t1), ry * sin(t1)]), [cx, cy]
+    # the arc is a fixed circle with pathLength 100, so progress is a dash offset
+    self.dom_nodes['anvil-m3-progressindicator-arc'].style.strokeDashoffset = 100 - v
+
+  def bind_progress(self, source):
+    """Updates progress from source, a function returning the current progress,
+    once per animation frame while this indicator is on the page.
+    Call with None to stop."""
+    self._progress_source = source
+    if source is None:
+      progress.unbind(self)
+    elif self._mounted:
+      progress.bind(self, source)
+
+  def _on_mount(self, **event_args):
+    self._mounted = True
+    if self._progress_source is not None:
+      progress.bind(self, self._progress_source)
+    in_view.watch(self.dom_nodes['anvil-m3-progressindicator'], self._on_view_change)
+
+  def _on_cleanup(self, **event_args):
+    self._mounted = False
+    progress.unbind(self)
+    in_view.unwatch(self.dom_nodes['anvil-m3-progressindicator'])
+
+  def _on_view_change(self, visible):
+    # no point animating the indeterminate arc when nobody can see it
+    self.dom_nodes['anvil-m3-progressindicator'].classList.toggle(
+      'anvil-m3-progressindicator-paused', not visible
     )
-    eX, eY = self._f_vec_add(
-      self._f_matrix_times(rotMatrix, [rx * cos(t1 + delta), ry * sin(t1 + delta)]),
-      [cx, cy],
-    )
-    fA = 1 if delta > pi else 0
-    fS = 1 if delta > 0 else 0
-    return f"M {sX} {sY} A {rx} {ry} {(phi / (2 * pi)) * 360} {fA} {fS} {eX} {eY}"
 
   #!componentProp(m3.CircularProgressIndicator)!1: {name:"color",type:"color",description:"The colour of the progress bar"}
   #!componentProp(m3.CircularProgressIndicator)!1: {name:"visible",type:"boolean",description:"If True, the component will be displayed."}
@@ -114,5 +99,7 @@ class CircularProgressIndicator(CircularProgressIndicatorTemplate):
   #!componentProp(m3.CircularProgressIndicator)!1: {name:"tag",type:"object",description:"Use this property to store any extra data for the component."}
   #!componentProp(m3.CircularProgressIndicator)!1: {name:"type",type:"enum",options:["determinate", "indeterminate"],description:"Display a determinate or indeterminate progress indicator. Use determinate to set the progress with the progress property. Use indeterminate to express an unspecified amount of wait time."}
 
+  #!defMethod(_)!2: "Update the progress from a function returning the current progress, once per animation frame. Call with None to stop." ["bind_progress"]
+
 
 #!defClass(m3,CircularProgressIndicator,anvil.Component)!:
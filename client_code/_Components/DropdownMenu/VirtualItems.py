@@ -0,0 +1,133 @@
+from anvil.js.window import document, requestAnimationFrame, window
+
+from ..._utils import resize_observer
+
+ROW_HEIGHT = 48  # matches the height of .anvil-m3-menuItem-container
+OVERSCAN = 8  # rows rendered above and below the visible rows
+
+_hover_class = 'anvil-m3-menuItem-container-keyboardHover'
+_disabled_class = 'anvil-m3-menuItem-disabled'
+
+
+class VirtualItems:
+  """Renders DropdownMenu entries as plain rows, creating only the rows that are
+  in view in the scroll container (plus an overscan band). Rows are recycled as
+  the user scrolls, so the DOM size doesn't depend on the number of entries.
+
+  entries are (label, value, enabled) tuples. on_select is called with the index
+  of a clicked entry and the click event."""
+
+  def __init__(self, scroll_node, on_select):
+    self._scroll_node = scroll_node
+    self._on_select = on_select
+    self._entries = []
+    self._rows = {}  # index -> (row, label)
+    self._free = []
+    self._hover_index = None
+    self._frame_requested = False
+    self._attached = False
+
+    self.dom_node = document.createElement('div')
+    self.dom_node.classList.add('anvil-m3-dropdownMenu-virtual')
+    self.dom_node.addEventListener('click', self._handle_click)
+
+  def attach(self):
+    if not self._attached:
+      self._attached = True
+      self._scroll_node.addEventListener(
+        'scroll', self._request_render, {'passive': True}
+      )
+      # the max height is only set once the menu has been positioned
+      resize_observer.observe(self._scroll_node, self._request_render)
+      self._request_render()
+
+  def detach(self):
+    if self._attached:
+      self._attached = False
+      self._scroll_node.removeEventListener('scroll', self._request_render)
+      resize_observer.unobserve(self._scroll_node)
+
+  def set_entries(self, entries):
+    self._entries = entries
+    for index in list(self._rows):
+      self._release(index)
+    self._hover_index = None
+    self.dom_node.style.height = f"{len(entries) * ROW_HEIGHT}px"
+    self._request_render()
+
+  def set_hover(self, index):
+    old = self._rows.get(self._hover_index)
+    if old is not None:
+      old[0].classList.toggle(_hover_class, False)
+    self._hover_index = index
+    new = self._rows.get(index)
+    if new is not None:
+      new[0].classList.toggle(_hover_class, True)
+
+  def scroll_to_index(self, index):
+    node = self._scroll_node
+    top = self.dom_node.offsetTop + index * ROW_HEIGHT
+    scroll_top = node.scrollTop
+    height = node.clientHeight
+    if top < scroll_top:
+      node.scrollTop = top
+    elif top + ROW_HEIGHT > scroll_top + height:
+      node.scrollTop = top + ROW_HEIGHT - height
+    self.render()
+
+  def _request_render(self, *args):
+    if not self._frame_requested:
+      self._frame_requested = True
+      requestAnimationFrame(self.render)
+
+  def render(self, *args):
+    self._frame_requested = False
+    # read everything we need first so that the writes below don't force layout
+    top = self._scroll_node.scrollTop - self.dom_node.offsetTop
+    # before it's positioned the menu is as tall as every row, so cap the height
+    height = min(self._scroll_node.clientHeight, window.innerHeight)
+    first = max(0, int(top // ROW_HEIGHT) - OVERSCAN)
+    last = min(len(self._entries), int((top + height) // ROW_HEIGHT) + 1 + OVERSCAN)
+
+    for index in list(self._rows):
+      if index < first or index >= last:
+        self._release(index)
+    for index in range(first, last):
+      if index not in self._rows:
+        self._bind(index)
+
+  def _release(self, index):
+    row, label = self._rows.pop(index)
+    row.style.display = 'none'
+    self._free.append((row, label))
+
+  def _bind(self, index):
+    if self._free:
+      row, label = self._free.pop()
+    else:
+      row, label = self._create_row()
+    text, value, enabled = self._entries[index]
+    label.innerText = text
+    row.setAttribute('data-index', index)
+    row.style.transform = f"translateY({index * ROW_HEIGHT}px)"
+    row.classList.toggle(_disabled_class, not enabled)
+    row.classList.toggle(_hover_class, index == self._hover_index)
+    row.style.display = ''
+    self._rows[index] = (row, label)
+
+  def _create_row(self):
+    row = document.createElement('div')
+    row.className = 'anvil-m3-menuItem-container anvil-m3-dropdownMenu-virtual-row'
+    content = document.createElement('div')
+    content.className = 'anvil-m3-menuItem-content'
+    label = document.createElement('div')
+    label.className = 'anvil-m3-menuItem-labelText anvil-m3-menuItem-core'
+    content.appendChild(label)
+    row.appendChild(content)
+    self.dom_node.appendChild(row)
+    return row, label
+
+  def _handle_click(self, event):
+    row = event.target.closest('[data-index]')
+    if row is not None:
+      self._on_select(int(row.getAttribute('data-index')), event)
@@ -4,16 +4,52 @@ import anvil.server
 from anvil.js import get_dom_node
 from anvil.js.window import document
 
-from ..._utils import fui, noop
+from ..._utils import event_hub, fui
 from ..._utils.properties import (
+  ALWAYS,
   anvil_prop,
   get_unset_margin,
   get_unset_value,
   inline_editing,
   margin_property,
+  theme_color_to_css,
 )
 from ..MenuItem import MenuItem
 from ._anvil_designer import DropdownMenuTemplate
+from .VirtualItems import VirtualItems
+
+_PLACEHOLDER_KEY = object()
+_UNHASHABLE_KEY = object()
+
+
+def _longest_increasing(sequence):
+  """Returns the positions of a longest increasing run of the non-negative values
+  in sequence. Items at these positions are already in order and can stay put."""
+  tails = []
+  previous = [-1] * len(sequence)
+  for position, value in enumerate(sequence):
+    if value < 0:
+      continue
+    lo, hi = 0, len(tails)
+    while lo < hi:
+      mid = (lo + hi) // 2
+      if sequence[tails[mid]] < value:
+        lo = mid + 1
+      else:
+        hi = mid
+    if lo:
+      previous[position] = tails[lo - 1]
+    if lo == len(tails):
+      tails.append(position)
+    else:
+      tails[lo] = position
+
+  result = set()
+  position = tails[-1] if tails else -1
+  while position >= 0:
+    result.add(position)
+    position = previous[position]
+  return result
 
 
 class DropdownMenu(DropdownMenuTemplate):
@@ -22,7 +58,13 @@ class DropdownMenu(DropdownMenuTemplate):
     self.tag = anvil.ComponentTag()
     self._props = properties
     self._clean_items = []
+    self._entries = []
+    self._value_indices = {}
+    self._unhashable_indices = []
+    self._has_placeholder = False
     self._children = []
+    self._child_keys = []
+    self._virtual_items = None
     self._hoverIndex = None
     self.selected_value = None
     self._set_designer_text_placeholder, self._start_inline_editing = inline_editing(
@@ -31,7 +73,10 @@ class DropdownMenu(DropdownMenuTemplate):
       self._set_label,
       "label",
     )
-    self._cleanup = noop
+    self._floating = None
+    self._mounted = False
+    self._menu_attached = False
+    self._items_built = False
     self._has_focus = False
     self._menuNode = self.dom_nodes['anvil-m3-dropdownMenu-items-container']
     self._field = self.selection_field.dom_nodes['anvil-m3-textbox']
@@ -90,26 +135,61 @@ class DropdownMenu(DropdownMenuTemplate):
     }
 
   def _on_mount(self, **event_args):
-    document.addEventListener('keydown', self._handle_keyboard_events)
-    document.addEventListener('click', self._body_click)
-    document.body.append(self._menuNode)
-    self._cleanup = fui.auto_update(
-      self._field, self._menuNode, placement="bottom-start", offset=0
-    )
+    self._mounted = True
+    if self._virtual_items is not None:
+      self._virtual_items.attach()
     self._menuNode.addEventListener('click', self._child_clicked)
+    if not self._is_lazy() or self.menu.visible:
+      self._attach_menu()
+    if self.menu.visible:
+      self._floating.open()
 
   def _on_cleanup(self, **event_args):
-    document.removeEventListener('keydown', self._handle_keyboard_events)
-    document.removeEventListener('click', self._body_click)
+    self._mounted = False
+    event_hub.deactivate(self)
+    if self._virtual_items is not None:
+      self._virtual_items.detach()
     self._menuNode.removeEventListener('click', self._child_clicked)
-    self._cleanup()
+    if self._floating is not None:
+      self._floating.close()
     self._menuNode.remove()
+    self._menu_attached = False
+
+  def _is_lazy(self):
+    return self.lazy and not anvil.designer.in_designer
+
+  def _attach_menu(self):
+    if not self._menu_attached:
+      # Move the menu to the body to get around Anvil containers
+      # setting their overflow to hidden
+      document.body.append(self._menuNode)
+      self._menu_attached = True
+    if self._floating is None:
+      self._floating = fui.register(
+        self._field, self._menuNode, placement="bottom-start", offset=0
+      )
+
+  def _build_items(self):
+    if not self._items_built and self._virtual_items is None:
+      self._items_built = True
+      self._sync_menu_items(self._entries)
 
   def _handle_selection_field_focus(self, event):
     self._has_focus = True
+    self._update_document_events()
 
   def _handle_selection_field_blur(self, event):
     self._has_focus = False
+    self._update_document_events()
+
+  def _update_document_events(self):
+    # only listen to document events while we're focused or open
+    if self._has_focus or self.menu.visible:
+      event_hub.activate(
+        self, {'keydown': self._handle_keyboard_events, 'click': self._body_click}
+      )
+    else:
+      event_hub.deactivate(self)
 
   def _handle_keyboard_events(self, event):
     if not self._has_focus:
@@ -141,33 +221,33 @@ class DropdownMenu(DropdownMenuTemplate):
         self._attempt_select(event)
 
   def _iterate_hover(self, inc=True):
+    count = len(self._entries)
+    if not count:
+      return
     if inc:
-      if self._hoverIndex is None or self._hoverIndex is (len(self._children) - 1):
+      if self._hoverIndex is None or self._hoverIndex == count - 1:
         self._hoverIndex = -1
       self._hoverIndex += 1
     else:
       if self._hoverIndex is None or self._hoverIndex == 0:
-        self._hoverIndex = len(self._children)
+        self._hoverIndex = count
       self._hoverIndex -= 1
-    self._children[self._hoverIndex].dom_nodes[
-      'anvil-m3-menuItem-container'
-    ].scrollIntoView({'block': 'nearest'})
     self._update_hover_styles()
+    self._scroll_to_hover()
 
   def _attempt_select(self, event):
     if self._hoverIndex is not None:
-      self._children[self._hoverIndex].raise_event(
-        "click",
-        event=event,
-        keys={
-          "shift": event.shiftKey,
-          "alt": event.altKey,
-          "ctrl": event.ctrlKey,
-          "meta": event.metaKey,
-        },
-      )
+      self._select_entry(self._hoverIndex)
     self._set_menu_visibility(False)
 
+  def _select_entry(self, index):
+    if self._has_placeholder and index == 0:
+      if self.allow_none:
+        self.selected_value = None
+    else:
+      self.selected_value = self._entries[index][1]
+    self.raise_event("change")
+
   def _clear_hover_styles(self):
     if self._children is not None:
       for child in self._children:
@@ -176,6 +256,9 @@ class DropdownMenu(DropdownMenuTemplate):
         )
 
   def _update_hover_styles(self):
+    if self._virtual_items is not None:
+      self._virtual_items.set_hover(self._hoverIndex)
+      return
     self._clear_hover_styles()
     if self._hoverIndex is None:
       return
@@ -183,6 +266,16 @@ class DropdownMenu(DropdownMenuTemplate):
       'anvil-m3-menuItem-container'
     ].classList.toggle('anvil-m3-menuItem-container-keyboardHover', True)
 
+  def _scroll_to_hover(self):
+    if self._hoverIndex is None:
+      return
+    if self._virtual_items is not None:
+      self._virtual_items.scroll_to_index(self._hoverIndex)
+    else:
+      self._children[self._hoverIndex].dom_nodes[
+        'anvil-m3-menuItem-container'
+      ].scrollIntoView({'block': 'nearest'})
+
   def _handle_component_click(self, event):
     self._set_menu_visibility()
 
@@ -190,36 +283,42 @@ class DropdownMenu(DropdownMenuTemplate):
     if value is None:
       value = not self.menu.visible
 
+    if value:
+      # lazy menus are only built and moved to the body once they're opened
+      self._build_items()
+      if self._mounted:
+        self._attach_menu()
+    elif self._floating is not None:
+      self._floating.close()
+
     self.menu.visible = value
     self._menuNode.classList.toggle("anvil-m3-menu-hidden", not value)
 
     if value:
       selection_field_width = get_dom_node(self.selection_field).offsetWidth
       self._menuNode.style.width = f"{selection_field_width}px"
+      if self._mounted:
+        self._floating.open()
 
       # dealing with hover
-      selected_value = self.selected_value
-      for index, child in enumerate(self._children):
-        if child.tag.value == selected_value:
-          self._hoverIndex = index
-          break
-      else:  # no break
-        self._hoverIndex = None
+      self._hoverIndex = self._find_entry_index(self.selected_value)
 
       self._update_hover_styles()
 
       if not anvil.designer.in_designer:
         self.selection_field.trailing_icon = "mi:arrow_drop_up"
+        if self._virtual_items is not None:
+          self._virtual_items.render()
         if self._hoverIndex:
-          self._children[self._hoverIndex].dom_nodes[
-            'anvil-m3-menuItem-container'
-          ].scrollIntoView({'block': 'nearest'})
+          self._scroll_to_hover()
 
     else:
       self.selection_field.trailing_icon = "mi:arrow_drop_down"
       if self.selected_value is None:
         self._hoverIndex = None
 
+    self._update_document_events()
+
   def _body_click(self, event):
     icon = self.selection_field.dom_nodes['anvil-m3-icon-container']
     if (
@@ -228,6 +327,7 @@ class DropdownMenu(DropdownMenuTemplate):
       or icon.contains(event.target)
     ):
       self._has_focus = True
+      self._update_document_events()
       return
     self._set_menu_visibility(False)
 
@@ -238,52 +338,127 @@ class DropdownMenu(DropdownMenuTemplate):
   def form_show(self, **event_args):
     self._set_designer_text_placeholder()
 
-  def _create_menu_items(self):
-    self.menu.clear()
-    item_props = {
-      "hide_leading_icon": True,
-      "bold": self.items_bold,
-      "italic": self.items_italic,
-      "underline": self.items_underline,
-      "text_color": self.items_text_color,
-      "font_family": self.items_font_family,
-      "font_size": self.items_font_size,
-    }
-
-    p = MenuItem(**item_props, text=self.placeholder or "")
-    p.tag.value = None
-    p.tag.label = ""
-
-    def _handle_select_placeholder(**e):
-      if self.allow_none:
-        self.selected_value = None
-      self.raise_event("change")
-
-    if not self.allow_none:
-      p.enabled = False
-
-    self._children = []
-
-    if self.allow_none or self.placeholder:
-      p.add_event_handler('click', _handle_select_placeholder)
-      self.menu.add_component(p, slot="anvil-m3-menu-slot")
-      self._children.append(p)
-
+  def _set_items_style(self, name, value):
+    # items_* styles are set once on the menu container and inherited by
+    # every item via menu.css, so restyling never touches the items themselves
+    self._menuNode.classList.toggle(f'anvil-m3-dropdownMenu-items-{name}', bool(value))
+    if isinstance(value, str):
+      self._menuNode.style.setProperty(f'--anvil-m3-dropdownMenu-items-{name}', value)
+    else:
+      self._menuNode.style.removeProperty(f'--anvil-m3-dropdownMenu-items-{name}')
+
+  def _create_menu_items(self, rebuild=False):
+    if rebuild:
+      self.menu.clear()
+      self._children = []
+      self._child_keys = []
+      self._items_built = False
+
+    self._has_placeholder = bool(self.allow_none or self.placeholder)
+    entries = self._entries = []
+    if self._has_placeholder:
+      entries.append((self.placeholder or "", None, bool(self.allow_none)))
     for label, value in self._clean_items:
-      selection = MenuItem(**item_props, text=label)
-      selection.tag.value = value
-      selection.tag.label = label
-
-      def _handle_selection_click(value=value, **e):
-        self.selected_value = value
-        self.raise_event("change")
+      entries.append((label, value, True))
+    self._index_entries(entries)
 
-      selection.add_event_handler('click', _handle_selection_click)
-      self.menu.add_component(selection, slot="anvil-m3-menu-slot")
-      self._children.append(selection)
+    if self._virtual_items is not None:
+      self._virtual_items.set_entries(entries)
+    elif self._items_built or not self._is_lazy():
+      self._items_built = True
+      self._sync_menu_items(entries)
 
     self.selected_value = self.selected_value
 
+  def _index_entries(self, entries):
+    # value -> index of the first entry with that value
+    # unhashable values fall back to a linear scan over just those entries
+    value_indices = self._value_indices = {}
+    unhashable_indices = self._unhashable_indices = []
+    for index, (text, value, enabled) in enumerate(entries):
+      try:
+        value_indices.setdefault(value, index)
+      except TypeError:
+        unhashable_indices.append(index)
+
+  def _find_entry_index(self, value):
+    try:
+      index = self._value_indices.get(value)
+    except TypeError:
+      index = None
+    for unhashable_index in self._unhashable_indices:
+      if index is not None and unhashable_index > index:
+        break
+      if self._entries[unhashable_index][1] == value:
+        return unhashable_index
+    return index
+
+  def _get_entry_key(self, index, value):
+    if self._has_placeholder and index == 0:
+      return _PLACEHOLDER_KEY
+    try:
+      hash(value)
+    except TypeError:
+      return (_UNHASHABLE_KEY, id(value))
+    return value
+
+  def _sync_menu_items(self, entries):
+    # Reuse the existing MenuItems, keyed by value,
+    # so that only added, removed, moved or relabelled entries touch the DOM.
+    reusable = {}
+    for old_index in range(len(self._children) - 1, -1, -1):
+      key = self._child_keys[old_index]
+      reusable.setdefault(key, []).append((old_index, self._children[old_index]))
+
+    children = []
+    keys = []
+    old_indices = []
+    for index, (text, value, enabled) in enumerate(entries):
+      key = self._get_entry_key(index, value)
+      matches = reusable.get(key)
+      if matches:
+        old_index, item = matches.pop()
+        item.text = text
+      else:
+        old_index = -1
+        item = MenuItem(hide_leading_icon=True, text=text)
+        item.add_event_handler('click', self._handle_item_click)
+        self.menu.add_component(item, slot="anvil-m3-menu-slot")
+      item.enabled = enabled
+      item.tag.index = index
+      children.append(item)
+      keys.append(key)
+      old_indices.append(old_index)
+
+    for matches in reusable.values():
+      for old_index, item in matches:
+        item.remove_from_parent()
+
+    # walk backwards, moving only the items that aren't already in order
+    in_order = _longest_increasing(old_indices)
+    anchor = None
+    for position in range(len(children) - 1, -1, -1):
+      node = get_dom_node(children[position])
+      if position not in in_order:
+        next_node = node.nextSibling
+        if anchor is None:
+          in_place = next_node is None
+        else:
+          in_place = anchor.isSameNode(next_node)
+        if not in_place:
+          node.parentNode.insertBefore(node, anchor)
+      anchor = node
+
+    self._children = children
+    self._child_keys = keys
+
+  def _handle_item_click(self, sender, **event_args):
+    self._select_entry(sender.tag.index)
+
+  def _on_virtual_item_click(self, index, event):
+    if self._entries[index][2]:
+      self._select_entry(index)
+
   # DESIGNER INTERACTIONS
   def _anvil_get_interactions_(self):
     return [
@@ -427,29 +602,52 @@ class DropdownMenu(DropdownMenuTemplate):
     self._set_label(value)
     self._set_designer_text_placeholder()
 
-  @anvil_prop
+  @anvil_prop(compare=ALWAYS)
   def selected_value(self, value):
     if anvil.designer.in_designer:
       return
 
-    for child in self._children:
-      if child.tag.value == value:
-        self.selection_field.text = child.tag.label
-        break
-    else:  # no break
-      if value is not None:
-        self.selection_field.text = "<Invalid value>"
-      else:
-        self.selection_field.text = ""
+    index = self._find_entry_index(value)
+    if index is not None:
+      is_placeholder = self._has_placeholder and index == 0
+      self.selection_field.text = "" if is_placeholder else self._entries[index][0]
+    elif value is not None:
+      self.selection_field.text = "<Invalid value>"
+    else:
+      self.selection_field.text = ""
 
   @anvil_prop
   def placeholder(self, value):
     self.selection_field.placeholder = value
     self._recreate_items()
 
-  def _recreate_items(self):
+  def _recreate_items(self, rebuild=False):
     if self._init:
-      self._create_menu_items()
+      self._create_menu_items(rebuild)
+
+  @anvil_prop
+  def virtualize(self, value):
+    menu_container = self.menu.dom_nodes['anvil-m3-menu-items-container']
+    menu_container.classList.toggle('anvil-m3-menu-virtual', bool(value))
+    if value and self._virtual_items is None:
+      self._virtual_items = VirtualItems(
+        self._menuNode, self._on_virtual_item_click
+      )
+      menu_container.appendChild(self._virtual_items.dom_node)
+      if self._menuNode.isConnected:
+        self._virtual_items.attach()
+    elif not value and self._virtual_items is not None:
+      self._virtual_items.detach()
+      self._virtual_items.dom_node.remove()
+      self._virtual_items = None
+    self._recreate_items(rebuild=True)
+
+  @anvil_prop
+  def lazy(self, value):
+    if self._init and not self._is_lazy():
+      self._build_items()
+      if self._mounted:
+        self._attach_menu()
 
   @anvil_prop
   def items(self, value):
@@ -474,27 +672,27 @@ class DropdownMenu(DropdownMenuTemplate):
 
   @anvil_prop
   def items_italic(self, value):
-    self._recreate_items()
+    self._set_items_style('italic', value)
 
   @anvil_prop
   def items_underline(self, value):
-    self._recreate_items()
+    self._set_items_style('underline', value)
 
   @anvil_prop
   def items_text_color(self, value):
-    self._recreate_items()
+    self._set_items_style('color', theme_color_to_css(value) if value else None)
 
   @anvil_prop
   def items_bold(self, value):
-    self._recreate_items()
+    self._set_items_style('bold', value)
 
   @anvil_prop
   def items_font_family(self, value):
-    self._recreate_items()
+    self._set_items_style('font-family', value or None)
 
   @anvil_prop
   def items_font_size(self, value):
-    self._recreate_items()
+    self._set_items_style('font-size', f'{value}px' if value else None)
 
   #!componentProp(m3.DropdownMenu)!1: {name:"align",type:"enum",options:["left", "right", "center"],description:"The position of this component in the available space."}
   #!componentProp(m3.DropdownMenu)!1: {name:"appearance",type:"enum",options:["filled", "outlined"],description:"A predefined style for this component."}
@@ -541,6 +739,8 @@ class DropdownMenu(DropdownMenuTemplate):
   #!componentProp(m3.DropdownMenu)!1: {name:"spacing",type:"spacing",description:"The margin and padding (pixels) of the component."}
   #!componentProp(m3.DropdownMenu)!1: {name:"tooltip",type:"string",description:"The text to display when the mouse is hovered over this component."}
   #!componentProp(m3.DropdownMenu)!1: {name:"items",type:"string list",description:"The items to display in the menu."}
+  #!componentProp(m3.DropdownMenu)!1: {name:"lazy",type:"boolean",description:"If True, the menu items are only created when the menu is first opened, and the menu only tracks its position while it is open."}
+  #!componentProp(m3.DropdownMenu)!1: {name:"virtualize",type:"boolean",description:"If True, only the menu items in view are rendered. Use this for very long lists of items."}
   #!componentProp(m3.DropdownMenu)!1: {name:"selected_value",type:"object",description:"The value of the currently selected item. Can only be set at runtime."}
   #!componentProp(m3.DropdownMenu)!1: {name:"border_color",type:"color",description:"The colour of the border of this component."}
   #!componentProp(m3.DropdownMenu)!1: {name:"tag",type:"object",description:"Use this property to store any extra data for the component."}
@@ -26,7 +26,6 @@ class FileLoader(FileLoaderTemplate):
   def __init__(self, **properties):
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
     self.init_components(**properties)
 
     self._handle_change = self._handle_change
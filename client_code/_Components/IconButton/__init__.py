@@ -20,7 +20,6 @@ class IconButton(IconButtonTemplate):
   def __init__(self, **properties):
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
     self._appearance = ""
     self.init_components(**properties)
     self.dom_nodes['anvil-m3-iconbutton-container'].addEventListener(
@@ -1,6 +1,7 @@
 from anvil import *
 from anvil import HtmlTemplate
 
+from ..._utils import in_view
 from ..._utils.properties import (
   anvil_prop,
   get_unset_margin,
@@ -14,11 +15,29 @@ from ._anvil_designer import LinearProgressIndicatorTemplate
 
 class LinearProgressIndicator(LinearProgressIndicatorTemplate):
   def __init__(self, **properties):
-    self._tooltip_node = None
     self.tag = ComponentTag()
     self._props = properties
     self.init_components(**properties)
 
+    self.add_event_handler("x-anvil-page-added", self._on_mount)
+    self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
+
+  def _on_mount(self, **event_args):
+    in_view.watch(
+      self.dom_nodes['anvil-m3-progressindicator-linear'], self._on_view_change
+    )
+
+  def _on_cleanup(self, **event_args):
+    in_view.unwatch(self.dom_nodes['anvil-m3-progressindicator-linear'])
+
+  def _on_view_change(self, visible):
+    # no point running the indeterminate animation when nobody can see it
+    svg = self.dom_nodes['anvil-m3-progressindicator-indeterminate']
+    if visible:
+      svg.unpauseAnimations()
+    else:
+      svg.pauseAnimations()
+
   def _anvil_get_unset_property_values_(self):
     el = self.dom_nodes["anvil-m3-progressindicator-linear"]
     m = get_unset_margin(el, self.margin)
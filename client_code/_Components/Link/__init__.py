@@ -24,7 +24,6 @@ class Link(LinkTemplate):
     self.temp_url = None
     self.tag = anvil.ComponentTag()
     self._props = properties
-    self._tooltip_node = None
     self._set_designer_text_placeholder, self._start_inline_editing = inline_editing(
       self,
       self.dom_nodes['anvil-m3-link-text'],
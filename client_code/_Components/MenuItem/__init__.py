@@ -22,7 +22,6 @@ class MenuItem(MenuItemTemplate):
     # Set Form properties and Data Bindings.
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
     self.init_components(**properties)
     self.dom_nodes['anvil-m3-menuItem-container'].addEventListener(
       "click", self._handle_click
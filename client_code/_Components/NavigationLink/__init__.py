@@ -2,6 +2,8 @@ import anvil.designer
 import anvil.js
 from anvil import *
 
+from ..._utils import form_cache, navigation
+from ..._utils import prefetch as prefetcher
 from ..._utils.properties import (
   anvil_prop,
   bold_property,
@@ -24,15 +26,60 @@ class NavigationLink(NavigationLinkTemplate):
   def __init__(self, **properties):
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
+    self._hover_timeout = None
+    self._group = None
     # Set Form properties and Data Bindings.
     self.init_components(**properties)
-    self.dom_nodes['anvil-m3-navigation-link'].addEventListener(
-      "click", self._handle_click
-    )
+    link = self.dom_nodes['anvil-m3-navigation-link']
+    link.addEventListener("click", self._handle_click)
+    link.addEventListener("pointerenter", self._on_pointer_enter)
+    link.addEventListener("pointerleave", self._on_pointer_leave)
+    self.add_event_handler("x-anvil-page-added", self._on_mount)
     self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
+  def _can_prefetch(self, mode):
+    return (
+      self.prefetch == mode
+      and isinstance(self.navigate_to, str)
+      and not anvil.designer.in_designer
+    )
+
+  def _on_mount(self, **event_args):
+    if self._group is None:
+      self._group = navigation.get_group(self)
+      if self._group is not None:
+        self._group._add_link(self)
+    if self._can_prefetch("idle"):
+      prefetcher.request(self.navigate_to, self)
+
+  def _on_pointer_enter(self, event):
+    if self._can_prefetch("hover") and self._hover_timeout is None:
+      self._hover_timeout = anvil.js.window.setTimeout(
+        self._on_hover_intent, prefetcher.HOVER_INTENT_MS
+      )
+
+  def _on_hover_intent(self):
+    self._hover_timeout = None
+    prefetcher.request(self.navigate_to, self)
+
+  def _cancel_hover_intent(self):
+    if self._hover_timeout is None:
+      return False
+    anvil.js.window.clearTimeout(self._hover_timeout)
+    self._hover_timeout = None
+    return True
+
+  def _on_pointer_leave(self, event):
+    if not self._cancel_hover_intent() and self._can_prefetch("hover"):
+      prefetcher.cancel(self.navigate_to, self)
+
   def _on_cleanup(self, **event_args):
+    if self._group is not None:
+      self._group._remove_link(self)
+      self._group = None
+    self._cancel_hover_intent()
+    if isinstance(self.navigate_to, str):
+      prefetcher.cancel(self.navigate_to, self)
     if anvil.designer.in_designer:
       anvil.designer.register_interaction(
         self,
@@ -53,8 +100,9 @@ class NavigationLink(NavigationLinkTemplate):
       },
     )
     if self.navigate_to:
-      open_form(self.navigate_to)
+      # select while our group is still on the page, so the old link is cleared
       self.selected = True
+      form_cache.open_form(self.navigate_to, keep_alive=self.keep_alive)
 
   def _anvil_get_interactions_(self):
     return [
@@ -105,6 +153,8 @@ class NavigationLink(NavigationLinkTemplate):
   #!componentProp(m3.NavigationLink)!1: {name:"badge",type:"boolean",description:"If True, display a notification badge on the icon."}
   #!componentProp(m3.NavigationLink)!1: {name:"badge_count",type:"number",description:"The number to display on the badge."}
   #!componentProp(m3.NavigationLink)!1: {name:"navigate_to",type:"form",description:"The Form to navigate to when the link is clicked."}
+  #!componentProp(m3.NavigationLink)!1: {name:"keep_alive",type:"boolean",description:"If True, the Form navigated to is kept and reused when the link is clicked again, instead of being rebuilt."}
+  #!componentProp(m3.NavigationLink)!1: {name:"prefetch",type:"enum",options:["none", "hover", "idle"],description:"When to build the Form navigated to before the link is clicked: when the pointer rests on the link, or when the browser is idle."}
   #!componentProp(m3.NavigationLink)!1: {name:"tag",type:"object",description:"Use this property to store any extra data for the component."}
   #!componentProp(m3.NavigationLink)!1: {name:"background_color",type:"color",description:"The color of the background of this component."}
 
@@ -124,10 +174,18 @@ class NavigationLink(NavigationLinkTemplate):
   background_color = color_property(
     'anvil-m3-navigation-link-container', 'backgroundColor', 'background_color'
   )
-  navigate_to = anvil_prop("navigate_to")
+  keep_alive = anvil_prop("keep_alive", default_value=False)
+  prefetch = anvil_prop("prefetch", default_value="none")
+
+  @anvil_prop
+  def navigate_to(self, value):
+    if self._group is not None:
+      self._group._invalidate_targets()
 
   @anvil_prop
   def url(self, value):
+    if self._group is not None:
+      self._group._invalidate_targets()
     if value:
       self.dom_nodes['anvil-m3-navigation-link'].href = value
     else:
@@ -143,6 +201,11 @@ class NavigationLink(NavigationLinkTemplate):
 
   @anvil_prop
   def selected(self, value):
+    if self._group is not None:
+      if value:
+        self._group._set_selected(self)
+      else:
+        self._group._set_deselected(self)
     if value:
       self.dom_nodes['anvil-m3-navigation-link'].classList.add(
         'anvil-m3-navigation-link-selected'
@@ -28,7 +28,6 @@ class RadioButton(RadioButtonTemplate):
   def __init__(self, **properties):
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
     self._group = None
     self._group_set_from_code = False
     self._set_designer_text_placeholder, self._start_inline_editing = inline_editing(
@@ -85,7 +84,6 @@ class RadioButton(RadioButtonTemplate):
   # Properties
   enabled = enabled_property('anvil-m3-radiobutton-input')
   visible = HtmlTemplate.visible
-  value = anvil_prop('value')
   underline = underline_property('anvil-m3-radiobutton-label')
   italic = italic_property('anvil-m3-radiobutton-label')
   bold = bold_property('anvil-m3-radiobutton-label')
@@ -101,6 +99,11 @@ class RadioButton(RadioButtonTemplate):
   tooltip = tooltip_property('anvil-m3-radiobutton-component')
   role = role_property('anvil-m3-radiobutton-container')
 
+  @anvil_prop
+  def value(self, value):
+    if self._group is not None:
+      self._group._invalidate_values()
+
   def _set_text(self, value):
     self.dom_nodes['anvil-m3-radiobutton-label'].innerText = value
 
@@ -147,6 +150,11 @@ class RadioButton(RadioButtonTemplate):
   @selected.setter
   def selected(self, new_state):
     self.dom_nodes['anvil-m3-radiobutton-input'].checked = new_state
+    if self._group is not None:
+      if new_state:
+        self._group._set_selected(self)
+      else:
+        self._group._set_deselected(self)
 
     # The previously selected RadioButton needs deselecting in the designer yml
     if anvil.designer.in_designer and new_state and self._group is not None:
@@ -187,7 +195,7 @@ class RadioButton(RadioButtonTemplate):
 
   def _handle_change(self, event):
     if self._group is not None:
-      self._group._handle_change()
+      self._group._handle_change(self)
     self.raise_event("select")
 
 
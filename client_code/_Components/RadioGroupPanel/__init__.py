@@ -2,14 +2,19 @@ from anvil import *
 
 from ._anvil_designer import RadioGroupPanelTemplate
 
+_UNHASHABLE = object()  # index key for buttons whose value can't be hashed
+
 
 class RadioGroup(Component):
 
   _anvil_events_ = [{"name": "change", "defaultEvent": True}]
 
   def __init__(self):
-    self._buttons = []
+    # dicts keep registration order and make adding and removing buttons O(1)
+    self._buttons = {}
     self._selected_button = None
+    # value -> first button with that value, built on demand
+    self._value_index = None
 
   #!componentEvent(m3.RadioGroupPanel)!1: {name: "change", description: "When the Radio Button selection changes."}
   #!componentEvent(m3.RadioGroupPanel)!1: {name: "show", description: "When the component is shown on the screen."}
@@ -19,30 +24,68 @@ class RadioGroup(Component):
 
   @property
   def buttons(self):
-    return self._buttons
+    return list(self._buttons)
 
   def _add_button(self, button):
-    self._buttons.append(button)
+    self._buttons[button] = None
+    self._value_index = None
+    if button.selected:
+      self._set_selected(button)
 
   def _remove_button(self, button):
-    self._buttons.remove(button)
+    self._buttons.pop(button, None)
+    self._value_index = None
+    if self._selected_button is button:
+      self._selected_button = None
+
+  def _invalidate_values(self):
+    self._value_index = None
+
+  def _set_selected(self, button):
+    previous = self._selected_button
+    self._selected_button = button
+    if previous is not None and previous is not button:
+      # the browser only unchecks radios that are on the page
+      previous.selected = False
+
+  def _set_deselected(self, button):
+    if self._selected_button is button:
+      self._selected_button = None
+
+  def _get_button_for_value(self, value):
+    index = self._value_index
+    if index is None:
+      index = self._value_index = {}
+      unhashable = []
+      for button in self._buttons:
+        try:
+          index.setdefault(button.value, button)
+        except TypeError:
+          unhashable.append(button)
+      index[_UNHASHABLE] = unhashable
+    try:
+      return index.get(value)
+    except TypeError:
+      pass
+    for button in index[_UNHASHABLE]:
+      if button.value == value:
+        return button
+    return None
 
-  def _handle_change(self):
+  def _handle_change(self, button):
+    self._set_selected(button)
     self.raise_event("x-anvil-write-back-selected_value")
     self.raise_event("change")
 
   @property
   def selected_button(self):
-    for button in self._buttons:
-      if button.selected:
-        return button
-    return None
+    return self._selected_button
 
   @selected_button.setter
   def selected_button(self, button):
     if button is None:
       # Deselect the currently selected button
-      selected_button = self.selected_button
+      selected_button = self._selected_button
       if selected_button:
         selected_button.selected = False
     else:
@@ -52,7 +95,7 @@ class RadioGroup(Component):
 
   @property
   def selected_value(self):
-    button = self.selected_button
+    button = self._selected_button
     if button is None:
       return None
     else:
@@ -60,11 +103,7 @@ class RadioGroup(Component):
 
   @selected_value.setter
   def selected_value(self, requested_value):
-    for button in self._buttons:
-      if button.value == requested_value:
-        self.selected_button = button
-        return
-    self.selected_button = None
+    self.selected_button = self._get_button_for_value(requested_value)
 
   @classmethod
   def enclosing(cls, component):
@@ -1,9 +1,13 @@
+import math
+import time
+
 import anvil.js
 from anvil import *
 from anvil import HtmlTemplate
 from anvil.designer import in_designer
-from anvil.js.window import ResizeObserver, document
+from anvil.js.window import document, requestAnimationFrame, window
 
+from ..._utils import resize_observer
 from ..._utils.properties import (
   anvil_prop,
   color_property,
@@ -15,6 +19,8 @@ from ..._utils.properties import (
 )
 from ._anvil_designer import SliderTemplate
 
+MIN_MARKER_SPACING = 8  # px between the starts of two markers, markers are 4px
+
 
 class Slider(SliderTemplate):
   def __init__(self, **properties):
@@ -25,8 +31,12 @@ class Slider(SliderTemplate):
     self.label.classList.add('anvil-m3-slider-label')
     self.label_container.appendChild(self.label)
     self._props = properties
-    self._tooltip_node = None
     self._mounted = False
+    self._track_width = 0
+    self._progress_requested = False
+    self._at_min = None
+    self._change_timeout = None
+    self._last_change_time = 0
     self.init_components(**properties)
 
     self.dom_nodes["anvil-m3-slider-input"].addEventListener("input", self._on_input)
@@ -38,17 +48,13 @@ class Slider(SliderTemplate):
     self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
   def _on_mount(self, **event_args):
-    self.resize_observer = ResizeObserver(self._on_window_resize)
-    self.resize_observer.observe(self.dom_nodes['anvil-m3-slider'])
+    resize_observer.observe(self.dom_nodes['anvil-m3-slider'], self._on_window_resize)
     self._mounted = True
-    self._set_markers()
-    self.dom_nodes[
-      'anvil-m3-slider-track-container'
-    ].style.width = self._get_track_width()
+    self._layout_track()
     self._update_progress()
 
   def _on_cleanup(self, **event_args):
-    self.resize_observer.unobserve(self.dom_nodes['anvil-m3-slider'])
+    resize_observer.unobserve(self.dom_nodes['anvil-m3-slider'])
     self._mounted = False
 
   def _anvil_get_unset_property_values_(self):
@@ -57,10 +63,28 @@ class Slider(SliderTemplate):
     return {"margin": m}
 
   def _on_change(self, event):
+    if self._change_timeout is not None:
+      # make sure the final value is sent before change_end
+      self._raise_change()
     self.raise_event("change_end")
 
   def _on_input(self, event):
     self._update_progress()
+    throttle_ms = self.change_throttle_ms
+    if not throttle_ms:
+      self.raise_event("change")
+    elif self._change_timeout is None:
+      wait = throttle_ms - (time.time() - self._last_change_time) * 1000
+      if wait > 0:
+        self._change_timeout = window.setTimeout(self._raise_change, wait)
+      else:
+        self._raise_change()
+
+  def _raise_change(self, *args):
+    if self._change_timeout is not None:
+      window.clearTimeout(self._change_timeout)
+      self._change_timeout = None
+    self._last_change_time = time.time()
     self.raise_event("change")
 
   def _on_mouse_down(self, event):
@@ -72,43 +96,48 @@ class Slider(SliderTemplate):
     document.removeEventListener("mouseup", self._on_mouse_up)
 
   def _on_window_resize(self, *args):
-    self.dom_nodes[
-      'anvil-m3-slider-track-container'
-    ].style.width = self._get_track_width()
-    self._set_markers()
+    self._layout_track()
     self._update_progress()
 
   def _update_progress(self):
+    # the progress, background and label all follow one CSS variable,
+    # which is written at most once per frame
+    if not self._progress_requested:
+      self._progress_requested = True
+      requestAnimationFrame(self._apply_progress)
+
+  def _apply_progress(self, *args):
+    self._progress_requested = False
     slider = self.dom_nodes["anvil-m3-slider-input"]
-    progress = self.dom_nodes["anvil-m3-slider-progress"]
-    background = self.dom_nodes["anvil-m3-slider-background"]
     range = float(slider.max) - float(slider.min)
     abs_value = float(slider.value) - float(slider.min)
-    percent = (abs_value / range) * 100
-    progress.style.width = f"max(calc({percent}% - 6px), 0px)"
-    background.style.width = f"max(calc({100-percent}% - 6px), 0px)"
-    progress_right, progress_top = self._check_position()
+    percent = (abs_value / range) * 100 if range else 0
+    self.dom_nodes["anvil-m3-slider"].style.setProperty(
+      '--anvil-m3-slider-percent', percent
+    )
+    self.label_container.style.setProperty('--anvil-m3-slider-percent', percent)
     self.label.textContent = slider.value
-    self.label_container.style.left = str(progress_right) + "px"
-    self.label_container.style.top = str(progress_top) + "px"
-    if slider.value == slider.min:
-      self.label_container.style.marginLeft = '-25px'
-    else:
-      self.label_container.style.marginLeft = '-18px'
+    at_min = slider.value == slider.min
+    if at_min != self._at_min:
+      self._at_min = at_min
+      self.label_container.classList.toggle('anvil-m3-slider-label-at-min', at_min)
 
   def _get_track_width(self):
     input = self.dom_nodes["anvil-m3-slider-input"]
     input_width = input.getBoundingClientRect().width
-    return str(input_width - 4) + "px"
-
-  def _check_position(self):
-    progress_rect = self.dom_nodes["anvil-m3-slider-progress"].getBoundingClientRect()
-    progress_right = progress_rect.right
-    progress_top = progress_rect.top
-    return progress_right, progress_top
+    return input_width - 4
 
   def _do_show_label(self):
     if self.show_label:
+      # measure the track once, before dragging starts
+      # the label's position then only depends on the percent variable
+      track_rect = self.dom_nodes[
+        "anvil-m3-slider-track-container"
+      ].getBoundingClientRect()
+      style = self.label_container.style
+      style.setProperty('--anvil-m3-slider-track-left', f"{track_rect.left}px")
+      style.setProperty('--anvil-m3-slider-track-top', f"{track_rect.top}px")
+      style.setProperty('--anvil-m3-slider-track-width', f"{track_rect.width}px")
       self.label_container.remove()
       document.body.appendChild(self.label_container)
       self._update_progress()
@@ -116,29 +145,35 @@ class Slider(SliderTemplate):
   def _do_hide_label(self):
     self.label_container.remove()
 
+  def _layout_track(self):
+    self._track_width = self._get_track_width()
+    width = f"{self._track_width}px"
+    self.dom_nodes['anvil-m3-slider-track-container'].style.width = width
+    self.dom_nodes['anvil-m3-slider-markers-container-bg'].style.width = width
+    self.dom_nodes['anvil-m3-slider-markers-container-progress'].style.width = width
+    self._set_markers()
+
   def _set_markers(self):
+    # Markers are a repeating background on each markers container,
+    # so the number of elements doesn't depend on the number of steps.
     slider = self.dom_nodes["anvil-m3-slider-input"]
-    markers_container_bg = self.dom_nodes["anvil-m3-slider-markers-container-bg"]
-    markers_container_progress = self.dom_nodes[
-      "anvil-m3-slider-markers-container-progress"
-    ]
-    markers_container_bg.innerHTML = ''
-    markers_container_progress.innerHTML = ''
-    markers_container_bg.style.width = self._get_track_width()
-    markers_container_progress.style.width = self._get_track_width()
+    full_slider = self.dom_nodes["anvil-m3-slider"]
     slider_range = float(slider.max) - float(slider.min)
     if slider.step != 'null':
       marker_count = int(slider_range // float(slider.step))
     else:
       marker_count = slider_range
-    if self.show_markers:
-      for i in range(marker_count + 1):
-        marker_bg = document.createElement('span')
-        marker_progress = document.createElement('span')
-        marker_bg.classList.add('anvil-m3-slider-marker-bg')
-        marker_progress.classList.add('anvil-m3-slider-marker-progress')
-        markers_container_bg.appendChild(marker_bg)
-        markers_container_progress.appendChild(marker_progress)
+
+    show_markers = bool(self.show_markers and marker_count > 0)
+    full_slider.classList.toggle('anvil-m3-slider-show-markers', show_markers)
+    if not show_markers:
+      return
+
+    # too many markers to tell apart - only show every nth step
+    max_count = max(int((self._track_width - 4) // MIN_MARKER_SPACING), 1)
+    if marker_count > max_count:
+      marker_count = marker_count / math.ceil(marker_count / max_count)
+    full_slider.style.setProperty('--anvil-m3-slider-marker-count', marker_count)
 
   #!componentProp(m3.Slider)!1: {name:"show_label",type:"boolean",description:"If True, display a label above the thumb with the current value."}
   #!componentProp(m3.Slider)!1: {name:"progress_color",type:"color",description:"The colour of the progress bar"}
@@ -152,6 +187,7 @@ class Slider(SliderTemplate):
   #!componentProp(m3.Slider)!1: {name:"min",type:"number",description:"The minimum value of the Slider."}
   #!componentProp(m3.Slider)!1: {name:"max",type:"number",description:"The maximum value of the Slider."}
   #!componentProp(m3.Slider)!1: {name:"step",type:"number",description:"The stepping interval for the Slider."}
+  #!componentProp(m3.Slider)!1: {name:"change_throttle_ms",type:"number",description:"The minimum time (milliseconds) between change events while dragging. The final value is always sent."}
   #!componentProp(m3.Slider)!1: {name:"show_markers",type:"boolean",description:"If True, display discrete markers on the track."}
   #!componentProp(m3.Slider)!1: {name:"margin",type:"margin",description:"The margin (pixels) of the component."}
   #!componentProp(m3.Slider)!1: {name:"track_color",type:"color",description:"The colour of the slider track."}
@@ -171,6 +207,7 @@ class Slider(SliderTemplate):
   visible = HtmlTemplate.visible
   role = role_property('anvil-m3-slider')
   show_label = anvil_prop("show_label")
+  change_throttle_ms = anvil_prop("change_throttle_ms")
 
   @anvil_prop
   def thumb_color(self, value=None):
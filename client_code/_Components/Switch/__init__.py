@@ -21,7 +21,6 @@ class Switch(SwitchTemplate):
   def __init__(self, **properties):
     # Set Form properties and Data Bindings.
     self.tag = ComponentTag()
-    self._tooltip_node = None
     self._props = properties
     self.init_components(**properties)
     self.dom_nodes['anvil-m3-switch-input'].addEventListener(
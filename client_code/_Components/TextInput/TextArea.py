@@ -1,8 +1,8 @@
 import anvil.designer
 import anvil.js
 import anvil.server
-from anvil.js.window import ResizeObserver, requestAnimationFrame
 
+from ..._utils import auto_grow, resize_observer
 from ..._utils.properties import (
   anvil_prop,
   bold_property,
@@ -10,6 +10,7 @@ from ..._utils.properties import (
   font_family_property,
   font_size_property,
   get_unset_value,
+  init_unset_properties,
   italic_property,
   style_property,
   underline_property,
@@ -35,25 +36,24 @@ height_property = {
 
 class TextArea(TextInput):
   _anvil_properties_ = [text_property, height_property, *TextInput._anvil_properties_]
+  _unset_init_order = (
+    "display_italic",
+    "display_bold",
+    "display_underline",
+    "display_font_size",
+    "display_font",
+    "display_text_color",
+    "background_color",
+    "align",
+    "placeholder",
+    "label",
+    "enabled",
+    "character_limit",
+  )
 
   def __init__(self, **properties):
     super().__init__(**properties)
-    self.init_components(**properties)
-
-    self.display_italic = self.display_italic
-    self.display_bold = self.display_bold
-    self.display_underline = self.display_underline
-    self.display_font_size = self.display_font_size
-    self.display_font = self.display_font
-    self.display_text_color = self.display_text_color
-    self.background_color = self.background_color
-    self.align = self.align
-    self.placeholder = self.placeholder
-    self.label = self.label
-    self.text = self.text
-    self.enabled = self.enabled
-    self.height = self.height
-    self.character_limit = self.character_limit
+    init_unset_properties(self, properties, self._unset_init_order)
 
     hiddenInput = self.dom_nodes['anvil-m3-textbox']
     self.dom_nodes['anvil-m3-input-container'].removeChild(hiddenInput)
@@ -62,6 +62,8 @@ class TextArea(TextInput):
     self._on_focus = self._on_focus
     self._on_lost_focus = self._on_lost_focus
 
+    if auto_grow.NATIVE_SIZING:
+      self.dom_nodes['anvil-m3-textarea'].classList.add('anvil-m3-textarea-autosize')
     self.dom_nodes['anvil-m3-textarea'].addEventListener(
       "input", self._expand_to_fit_content
     )
@@ -74,11 +76,10 @@ class TextArea(TextInput):
     self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
   def _on_mount(self, **event_args):
-    self.resize_observer = ResizeObserver(self._on_resize)
-    self.resize_observer.observe(self.dom_nodes['anvil-m3-textarea'])
+    resize_observer.observe(self.dom_nodes['anvil-m3-textarea'], self._on_resize)
 
   def _on_cleanup(self, **event_args):
-    self.resize_observer.unobserve(self.dom_nodes['anvil-m3-textarea'])
+    resize_observer.unobserve(self.dom_nodes['anvil-m3-textarea'])
 
   def _anvil_get_unset_property_values_(self):
     common_props = TextInput._get_common_unset_property_values_(self)
@@ -87,24 +88,24 @@ class TextArea(TextInput):
     )
     return common_props
 
+  def _needs_fit(self):
+    # native sizing only applies while the textarea has no explicit height,
+    # e.g. from the height property or the resize handle
+    return (
+      not auto_grow.NATIVE_SIZING
+      or bool(self.dom_nodes['anvil-m3-textarea'].style.height)
+    )
+
   def _expand_to_fit_content(self, event):
-    if event.target.scrollHeight > event.target.clientHeight:
-      self.dom_nodes[
-        'anvil-m3-textarea'
-      ].style.height = '56px'  # Min-height based off M3 specs
-      self._set_height(event.target.scrollHeight)
+    if self._needs_fit():
+      auto_grow.request(self)
 
-  def _on_resize(self, entries, observer):
-    for entry in entries:
-      h = entry.target.scrollHeight
-    requestAnimationFrame(lambda _: self._set_height(h))
+  def _on_resize(self, entry):
+    auto_grow.request(self, self._needs_fit())
 
   def _set_height(self, h):
-    # Keep this function, because it's easier to call it from a lambda than setting the height property.
     self.dom_nodes['anvil-m3-textarea'].style.height = f'{h}px'
-    self.dom_nodes[
-      'anvil-m3-border-container'
-    ].style.height = f"{self.dom_nodes['anvil-m3-textarea'].clientHeight}px"
+    auto_grow.request(self, fit=False)
 
   def _set_id(self, value):
     super()._set_id(value)
@@ -238,6 +239,9 @@ class TextArea(TextInput):
 
   #!componentProp(m3.TextArea)!1: {name:"supporting_text",type:"string",description:"The supporting text displayed underneath this component"}
   #!componentProp(m3.TextArea)!1: {name:"character_limit",type:"number",description:"The max number of characters a user can enter into this component. The limit is displayed below the component."}
+  #!componentProp(m3.TextArea)!1: {name:"change_mode",type:"enum",options:["immediate", "debounce", "throttle"],description:"When the change event is raised while the user types. 'debounce' waits for a pause in typing, 'throttle' raises it at most once per interval."}
+  #!componentProp(m3.TextArea)!1: {name:"debounce_ms",type:"number",description:"The pause in typing (milliseconds) before the change event is raised, if change_mode is debounce."}
+  #!componentProp(m3.TextArea)!1: {name:"throttle_ms",type:"number",description:"The minimum time (milliseconds) between change events, if change_mode is throttle."}
   #!componentProp(m3.TextArea)!1: {name:"subcontent_color",type:"color",description:"The colour of the supporting text and the character limit underneath this component."}
   #!componentProp(m3.TextArea)!1: {name:"subcontent_font_family",type:"color",description:"The font family to use for the supporting text and the character limit underneath this component."}
   #!componentProp(m3.TextArea)!1: {name:"subcontent_font_size",type:"color",description:"The font size of the supporting text and the character limit displayed underneath this component."}
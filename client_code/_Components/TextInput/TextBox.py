@@ -8,6 +8,7 @@ from ..._utils.properties import (
   font_family_property,
   font_size_property,
   get_unset_value,
+  init_unset_properties,
   italic_property,
   property_with_callback,
   underline_property,
@@ -103,29 +104,29 @@ class TextBox(TextInput):
     *TextInput._anvil_properties_,
   ]
   _anvil_events_ = [click_event, pressed_enter_event, *TextInput._anvil_events_]
+  _unset_init_order = (
+    "display_italic",
+    "display_bold",
+    "display_underline",
+    "display_font_size",
+    "display_font_family",
+    "display_text_color",
+    "background_color",
+    "leading_icon_color",
+    "trailing_icon_color",
+    "placeholder",
+    "label",
+    "enabled",
+    "leading_icon",
+    "character_limit",
+    "type",
+    "hide_text",
+    "error",
+  )
 
   def __init__(self, **properties):
     super().__init__(**properties)
-    self.init_components(**properties)
-
-    self.display_italic = self.display_italic
-    self.display_bold = self.display_bold
-    self.display_underline = self.display_underline
-    self.display_font_size = self.display_font_size
-    self.display_font_family = self.display_font_family
-    self.display_text_color = self.display_text_color
-    self.background_color = self.background_color
-    self.leading_icon_color = self.leading_icon_color
-    self.trailing_icon_color = self.trailing_icon_color
-    self.placeholder = self.placeholder
-    self.text = self.text
-    self.label = self.label
-    self.enabled = self.enabled
-    self.error = self.error
-    self.leading_icon = self.leading_icon
-    self.character_limit = self.character_limit
-    self.type = self.type
-    self.hide_text = self.hide_text
+    init_unset_properties(self, properties, self._unset_init_order)
 
     hiddenInput = self.dom_nodes['anvil-m3-textarea']
     self.dom_nodes['anvil-m3-input-container'].removeChild(hiddenInput)
@@ -147,7 +148,11 @@ class TextBox(TextInput):
 
   def _on_key_down(self, e):
     if e.key == "Enter":
-      self.raise_event("x-anvil-write-back-text")
+      if self._change_timeout is not None:
+        # send the pending change before pressed_enter
+        self._flush_change()
+      else:
+        self.raise_event("x-anvil-write-back-text")
       self.raise_event("pressed_enter")
 
   def _handle_click(self, event):
@@ -283,7 +288,12 @@ class TextBox(TextInput):
       trailing_icon.innerText = ""
       text_box_input.style.paddingRight = "16px"
 
-  trailing_icon = property_with_callback('trailing_icon', _set_trailing_icon)
+  def _on_trailing_icon_change(self, value):
+    # the error icon takes precedence over the trailing icon
+    if not self.error:
+      self._set_trailing_icon(value)
+
+  trailing_icon = property_with_callback('trailing_icon', _on_trailing_icon_change)
 
   @anvil_prop
   def character_limit(self, value):
@@ -299,7 +309,9 @@ class TextBox(TextInput):
 
   @anvil_prop
   def type(self, value):
-    self.dom_nodes['anvil-m3-textbox'].setAttribute("type", value)
+    self.dom_nodes['anvil-m3-textbox'].setAttribute(
+      "type", "password" if self.hide_text else value
+    )
 
   @anvil_prop
   def hide_text(self, value):
@@ -338,6 +350,9 @@ class TextBox(TextInput):
 
   #!componentProp(m3.TextBox)!1: {name:"supporting_text",type:"string",description:"The supporting text displayed below this component"}
   #!componentProp(m3.TextBox)!1: {name:"character_limit",type:"number",description:"The max number of characters a user can enter into this component. The limit is displayed below the component."}
+  #!componentProp(m3.TextBox)!1: {name:"change_mode",type:"enum",options:["immediate", "debounce", "throttle"],description:"When the change event is raised while the user types. 'debounce' waits for a pause in typing, 'throttle' raises it at most once per interval."}
+  #!componentProp(m3.TextBox)!1: {name:"debounce_ms",type:"number",description:"The pause in typing (milliseconds) before the change event is raised, if change_mode is debounce."}
+  #!componentProp(m3.TextBox)!1: {name:"throttle_ms",type:"number",description:"The minimum time (milliseconds) between change events, if change_mode is throttle."}
   #!componentProp(m3.TextBox)!1: {name:"subcontent_color",type:"color",description:"The colour of the supporting text and the character limit below this component."}
   #!componentProp(m3.TextBox)!1: {name:"subcontent_font_family",type:"color",description:"The font family to use for the supporting text and the character limit below this component."}
   #!componentProp(m3.TextBox)!1: {name:"subcontent_font_size",type:"color",description:"The font size of the supporting text and the character limit displayed below this component."}
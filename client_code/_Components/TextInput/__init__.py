@@ -1,6 +1,9 @@
+import time
+
 import anvil.server
 from anvil import *
 from anvil import HtmlTemplate
+from anvil.js.window import window
 
 from ..._utils import gen_id
 from ..._utils.properties import (
@@ -25,10 +28,13 @@ class TextInput(TextInputTemplate):
   def __init__(self, **properties):
     self.tag = ComponentTag()
     self._props = properties
-    self._tooltip_node = None
+    self._change_target = None
+    self._change_timeout = None
+    self._last_change_time = 0
     self.init_components(**properties)
 
     self._on_input = self._on_input
+    self._flush_change = self._flush_change
 
   def _get_common_unset_property_values_(self):
     el = self.dom_nodes['anvil-m3-textinput']
@@ -53,13 +59,54 @@ class TextInput(TextInputTemplate):
     self.dom_nodes["anvil-m3-character-amount"].setAttribute("for", value)
 
   def _on_input(self, e):
-    self.dom_nodes['anvil-m3-character-amount'].innerText = len(e.target.value)
-    # input event is anvil's change event
+    self._change_target = e.target
+    mode = self.change_mode
+    if mode == "debounce":
+      # wait for a pause in typing
+      self._cancel_change_timeout()
+      self._schedule_change(self.debounce_ms)
+    elif mode == "throttle":
+      # at most one change per interval, the last value is always sent
+      if self._change_timeout is None:
+        elapsed = (time.time() - self._last_change_time) * 1000
+        wait = (self.throttle_ms or 0) - elapsed
+        if wait > 0:
+          self._schedule_change(wait)
+        else:
+          self._flush_change()
+    else:
+      self._update_character_amount()
+      # input event is anvil's change event
+      self.raise_event("change")
+
+  def _schedule_change(self, wait):
+    self._change_timeout = window.setTimeout(self._flush_change, wait or 0)
+
+  def _cancel_change_timeout(self):
+    if self._change_timeout is not None:
+      window.clearTimeout(self._change_timeout)
+      self._change_timeout = None
+
+  def _flush_change(self, *args):
+    # debounced and throttled changes also write back, so bound data
+    # is updated once per change rather than once per key
+    self._cancel_change_timeout()
+    self._last_change_time = time.time()
+    self._update_character_amount()
+    self.raise_event("x-anvil-write-back-text")
     self.raise_event("change")
 
+  def _update_character_amount(self):
+    if self._change_target is not None:
+      amount = len(self._change_target.value)
+      self.dom_nodes['anvil-m3-character-amount'].innerText = amount
+
   def _on_change(self, e):
     # On text input/textarea the change event fires when we lose focus
-    self.raise_event("x-anvil-write-back-text")
+    if self._change_timeout is not None:
+      self._flush_change()
+    else:
+      self.raise_event("x-anvil-write-back-text")
 
   def _on_focus(self, e):
     self.raise_event("focus")
@@ -82,6 +129,15 @@ class TextInput(TextInputTemplate):
       }
     ]
 
+  @anvil_prop(default_value="immediate")
+  def change_mode(self, value):
+    # don't hold on to a change that was waiting under the old mode
+    if self._change_timeout is not None:
+      self._flush_change()
+
+  debounce_ms = anvil_prop("debounce_ms", default_value=300)
+  throttle_ms = anvil_prop("throttle_ms", default_value=300)
+
   visible = HtmlTemplate.visible
   label_italic = italic_property('anvil-m3-label-text', 'label_italic')
   label_bold = bold_property('anvil-m3-label-text', 'label_bold')
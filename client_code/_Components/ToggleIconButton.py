@@ -1,7 +1,11 @@
 import anvil.designer
 import anvil.server
 
-from .._utils.properties import property_with_callback, theme_color_to_css
+from .._utils.properties import (
+  init_unset_properties,
+  property_with_callback,
+  theme_color_to_css,
+)
 from .IconButton import IconButton
 
 selected_property = {
@@ -51,28 +55,25 @@ class ToggleIconButton(IconButton):
 
   def __init__(self, **properties):
     super().__init__(**properties)
-    self.init_components(**properties)
-
-    self.border = self.border
-    self.icon_color = self.icon_color
-    self.background_color = self.background_color
-    self.selected_border = self.selected_border
-    self.selected_background_color = self.selected_background_color
-    self.selected_icon_color = self.selected_icon_color
-    self.selected = self.selected
+    init_unset_properties(
+      self,
+      properties,
+      (
+        "border",
+        "icon_color",
+        "background_color",
+        "selected_border",
+        "selected_background_color",
+        "selected_icon_color",
+        "selected",
+      ),
+    )
 
     self.dom_nodes['anvil-m3-iconbutton-container'].classList.toggle(
       "anvil-m3-toggle", True
     )
     self.dom_nodes['anvil-m3-iconbutton-icon'].classList.toggle("anvil-m3-toggle", True)
 
-    self.dom_nodes['anvil-m3-iconbutton-container'].classList.toggle(
-      "anvil-m3-selected", self.selected
-    )
-    self.dom_nodes['anvil-m3-iconbutton-icon'].classList.toggle(
-      "anvil-m3-selected", self.selected
-    )
-
   def _anvil_get_interactions_(self):
     return [
       {
@@ -107,6 +108,9 @@ class ToggleIconButton(IconButton):
         theme_color_to_css(self.icon_color) if self.icon_color else None
       )
 
+  def _apply_current_styles(self, value):
+    self._apply_styles(self.selected)
+
   def _selected_setter(self, value):
     self.dom_nodes['anvil-m3-iconbutton-container'].classList.toggle(
       "anvil-m3-selected", value
@@ -153,14 +157,18 @@ class ToggleIconButton(IconButton):
 
   #!componentEvent(m3.ToggleIconButton)!1: {name: "click", description: "When the component is clicked.", parameters:[]}
 
-  border = property_with_callback("border", _apply_styles)
-  icon_color = property_with_callback("icon_color", _apply_styles)
-  background_color = property_with_callback("background_color", _apply_styles)
-  selected_border = property_with_callback("selected_border", _apply_styles)
+  border = property_with_callback("border", _apply_current_styles)
+  icon_color = property_with_callback("icon_color", _apply_current_styles)
+  background_color = property_with_callback(
+    "background_color", _apply_current_styles
+  )
+  selected_border = property_with_callback("selected_border", _apply_current_styles)
   selected_background_color = property_with_callback(
-    "selected_background_color", _apply_styles
+    "selected_background_color", _apply_current_styles
+  )
+  selected_icon_color = property_with_callback(
+    "selected_icon_color", _apply_current_styles
   )
-  selected_icon_color = property_with_callback("selected_icon_color", _apply_styles)
   selected = property_with_callback("selected", _selected_setter)
 
 
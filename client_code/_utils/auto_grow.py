@@ -0,0 +1,57 @@
+from anvil.js.window import CSS, requestAnimationFrame
+
+# Batched auto-grow for TextAreas.
+# Growing a textarea means reading its scrollHeight and writing its height.
+# Requests are collected and handled together on the next animation frame:
+# every textarea is measured first and then every height is written,
+# so there's at most one forced layout per frame however many are growing.
+# Where the browser supports field-sizing: content the textarea sizes itself
+# and only the border container needs to follow it.
+
+try:
+  NATIVE_SIZING = bool(CSS.supports("field-sizing", "content"))
+except Exception:
+  NATIVE_SIZING = False
+
+_frame_requested = False
+_pending = {}
+
+
+def request(component, fit=True):
+  """On the next frame, grows component's textarea to fit its content (if fit)
+  and matches the height of its border container to the textarea."""
+  _pending[component] = fit or _pending.get(component, False)
+  _request_frame()
+
+
+def _on_frame(*args):
+  global _frame_requested, _pending
+  _frame_requested = False
+  pending = _pending
+  _pending = {}
+
+  # read phase
+  measured = []
+  for component, fit in pending.items():
+    textarea = component.dom_nodes['anvil-m3-textarea']
+    client_height = textarea.clientHeight
+    scroll_height = textarea.scrollHeight if fit else 0
+    measured.append((component, textarea, client_height, scroll_height))
+
+  # write phase
+  for component, textarea, client_height, scroll_height in measured:
+    height = client_height
+    if scroll_height > client_height:
+      height = scroll_height
+      textarea.style.height = f"{height}px"
+    if getattr(component, "_border_height", None) != height:
+      component._border_height = height
+      component.dom_nodes['anvil-m3-border-container'].style.height = f"{height}px"
+
+
+def _request_frame():
+  global _frame_requested
+  if _frame_requested:
+    return
+  _frame_requested = True
+  requestAnimationFrame(_on_frame)
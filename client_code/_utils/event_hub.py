@@ -0,0 +1,46 @@
+from anvil.js.window import document
+
+# Shared document level listeners for menus.
+# Rather than each mounted menu listening on the document, a menu activates itself
+# while it is open or focused. One listener per event type is installed while any
+# menu is active, and events are only routed to the active menus.
+
+_active = {}
+_installed = set()
+
+
+def _dispatch(event):
+  for handlers in list(_active.values()):
+    handler = handlers.get(event.type)
+    if handler is not None:
+      handler(event)
+
+
+def _install(event_types):
+  for event_type in event_types:
+    if event_type not in _installed:
+      document.addEventListener(event_type, _dispatch)
+      _installed.add(event_type)
+
+
+def _uninstall():
+  for event_type in _installed:
+    document.removeEventListener(event_type, _dispatch)
+  _installed.clear()
+
+
+def activate(owner, handlers):
+  """Routes document events to owner.
+  handlers maps event types, e.g. 'keydown', to functions that take the event."""
+  _active[owner] = handlers
+  _install(handlers)
+
+
+def deactivate(owner):
+  """Stops routing document events to owner."""
+  if _active.pop(owner, None) is not None and not _active:
+    _uninstall()
+
+
+def is_active(owner):
+  return owner in _active
@@ -0,0 +1,122 @@
+import anvil
+from anvil.js.window import requestAnimationFrame, window
+
+# Keep-alive cache for forms opened by NavigationLinks with keep_alive set.
+# Forms are kept by name, least recently opened first, so reopening one reuses the
+# instance (with its layout and component state) instead of building it again.
+# Reopened forms get the usual hide and show events from being removed from and
+# added back to the page, and their scroll position is restored.
+# Forms can also be built ahead of time by prefetch(), ready for their first open.
+
+DEFAULT_MAX_SIZE = 5
+MAX_PREFETCHED = 3  # prefetched forms that haven't been opened yet
+
+_max_size = DEFAULT_MAX_SIZE
+_forms = {}  # form name -> [form, scroll position]
+_prefetched = {}  # form name -> form
+
+
+def set_max_size(size):
+  """Sets how many forms are kept alive. Setting it to 0 turns the cache off."""
+  global _max_size
+  _max_size = max(0, size)
+  _evict()
+
+
+def clear():
+  """Forgets every cached and prefetched form.
+  They will be built again when next opened."""
+  _forms.clear()
+  _prefetched.clear()
+
+
+def is_ready(form_name):
+  return form_name in _forms or form_name in _prefetched
+
+
+def can_prefetch():
+  """False once MAX_PREFETCHED forms have been built and not opened yet."""
+  return len(_prefetched) < MAX_PREFETCHED
+
+
+def prefetch(form_name, preload=None):
+  """Builds the named form without opening it, so that opening it is just a swap.
+  preload, if given, is called with the new form. Returns False if the form could
+  not be found, e.g. because it belongs to a dependency, if MAX_PREFETCHED
+  forms are already waiting to be opened, or if building it or preload raised.
+  Errors are printed rather than raised, since the form will be built again
+  when it is opened."""
+  if is_ready(form_name):
+    return True
+  if not can_prefetch():
+    # don't throw away work that has already been done to make room
+    return False
+  form_class = _get_form_class(form_name)
+  if form_class is None:
+    return False
+  try:
+    form = form_class()
+    if preload is not None:
+      preload(form)
+  except Exception as e:
+    _prefetched.pop(form_name, None)
+    print(f"Prefetching {form_name!r} failed: {e!r}")
+    return False
+  _prefetched[form_name] = form
+  return True
+
+
+def _get_form_class(form_name):
+  # Form names are relative to the app's package, which we get from the open form
+  current = anvil.get_open_form()
+  if current is None or ":" in form_name:
+    return None
+  package = type(current).__module__.split(".")[0]
+  class_name = form_name.rsplit(".", 1)[-1]
+  try:
+    module = __import__(f"{package}.{form_name}", fromlist=[class_name])
+    return getattr(module, class_name)
+  except (ImportError, AttributeError):
+    return None
+
+
+def open_form(form, keep_alive=True):
+  """Opens form, reusing the cached or prefetched instance if form is the name of
+  one. Unless keep_alive is False, the form is then kept in the cache."""
+  if not isinstance(form, str):
+    anvil.open_form(form)
+    return
+  if not keep_alive or not _max_size:
+    anvil.open_form(_prefetched.pop(form, form))
+    return
+
+  _remember_scroll(anvil.get_open_form())
+  cached = _forms.pop(form, None)
+  if cached is None:
+    prefetched = _prefetched.pop(form, None)
+    if prefetched is not None:
+      anvil.open_form(prefetched)
+    else:
+      anvil.open_form(form)
+    cached = [anvil.get_open_form(), 0]
+  else:
+    anvil.open_form(cached[0])
+    scroll_y = cached[1]
+    # wait for the form to be laid out before scrolling it
+    requestAnimationFrame(lambda *args: window.scrollTo(0, scroll_y))
+  _forms[form] = cached
+  _evict()
+
+
+def _remember_scroll(current):
+  if current is None:
+    return
+  for cached in _forms.values():
+    if cached[0] is current:
+      cached[1] = window.scrollY
+      return
+
+
+def _evict():
+  while len(_forms) > _max_size:
+    del _forms[next(iter(_forms))]
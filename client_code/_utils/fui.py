@@ -1,12 +1,68 @@
-from anvil.js.window import window
+from anvil.js.window import document, requestAnimationFrame, window
 
 # https://floating-ui.com/
+# The scripts are only loaded when the first floating element is opened.
+# Loading doesn't block: elements opened before the scripts have loaded are
+# positioned once they have. If loading fails the error is reported once and the
+# next call to open() tries again.
+_SCRIPTS = [
+  "_/theme/anvil-m3/floating-ui/core@1.6.7.js",
+  "_/theme/anvil-m3/floating-ui/dom@1.6.10.js",
+]
+
 try:
+  # already on the page, e.g. added by the app's native libraries
   FloatingUIDOM = window.FloatingUIDOM
 except AttributeError:
-  # don't fail on load - fail when we try to use it
   FloatingUIDOM = None
 
+_script_nodes = []  # the script elements of the load in progress
+_waiting = []
+
+
+def load():
+  """Starts loading Floating UI, unless it has loaded or is loading already.
+  Open elements waiting for it are positioned once it has loaded."""
+  if FloatingUIDOM is not None or _script_nodes:
+    return
+  for src in _SCRIPTS:
+    script = document.createElement("script")
+    script.src = src
+    # dynamic scripts run in insertion order with async off - dom needs core
+    setattr(script, "async", False)
+    # callbacks on the elements themselves, so nothing waits for the load
+    script.onerror = _on_load_error
+    document.head.append(script)
+    _script_nodes.append(script)
+  script.onload = _on_load
+
+
+def _on_load(*args):
+  global FloatingUIDOM
+  if not _script_nodes:
+    return  # an earlier script failed and that has been reported
+  del _script_nodes[:]
+  FloatingUIDOM = window.FloatingUIDOM
+  waiting = _waiting[:]
+  del _waiting[:]
+  for floating in waiting:
+    if floating.is_open:
+      floating._start()
+
+
+def _on_load_error(*args):
+  if not _script_nodes:
+    return  # only report a failed load once
+  # remove the failed attempt so that a later open() can try again
+  for script in _script_nodes:
+    script.remove()
+  del _script_nodes[:]
+  for floating in _waiting:
+    floating._open = False
+  del _waiting[:]
+  raise RuntimeError("FloatingUIDOM failed to load")
+
+
 _static_arrow_position = {
   'top': 'bottom',
   'right': 'left',
@@ -15,45 +71,123 @@ _static_arrow_position = {
 }
 
 
-def auto_update(
-  reference_el,
-  floating_el,
-  *,
-  placement="bottom",
-  strategy="absolute",
-  offset=6,
-  shift={"padding": 5},
-  hide={"padding": 15},
-  arrow=None,
-):
-  """starts auto updating position of floating element to a reference element
-  returns a cleanup function
-  if using arrow, arrow should be an HTMLElement
-  call this function in x-anvil-page-added
-  call the cleanup in x-anvil-page-removed"""
-  if FloatingUIDOM is None:
-    raise RuntimeError("FloatingUIDOM failed to load")
+class FloatingElement:
+  """Positions a floating element against a reference element while it is open.
+  Create one with register(). Nothing is tracked while the element is closed,
+  so components can keep one of these for as long as they're on the page."""
 
-  def update(*args):
-    middleware = [
-      FloatingUIDOM.offset(offset),
-      FloatingUIDOM.flip(),
-      FloatingUIDOM.shift(shift),
-      FloatingUIDOM.hide(hide),
-      FloatingUIDOM.size(size_middleware()),
-    ]
+  def __init__(
+    self, reference_el, floating_el, placement, strategy, offset, shift, hide, arrow
+  ):
+    self.reference_el = reference_el
+    self.floating_el = floating_el
+    self._placement = placement
+    self._strategy = strategy
+    self._offset = offset
+    self._shift = shift
+    self._hide = hide
+    self._arrow = arrow
+    self._options = None
+    self._open = False
+    self._stop = None
+    self._last_rects = None
+    self._frame_requested = False
 
-    if arrow:
-      middleware.append(FloatingUIDOM.arrow({"element": arrow}))
+  @property
+  def is_open(self):
+    return self._open
 
-    rv = FloatingUIDOM.computePosition(
-      reference_el,
-      floating_el,
-      {
-        'placement': placement,
-        'strategy': strategy,
+  def open(self):
+    """Start tracking the reference element. Positions the floating element now,
+    or as soon as Floating UI has loaded."""
+    if self._open:
+      return
+    self._open = True
+    if FloatingUIDOM is None:
+      if self not in _waiting:
+        _waiting.append(self)
+      load()
+    else:
+      self._start()
+
+  def close(self):
+    """Stop tracking until the next call to open()."""
+    self._open = False
+    stop = self._stop
+    if stop is not None:
+      self._stop = None
+      stop()
+
+  def update(self):
+    """Recompute the position now, even if nothing seems to have moved."""
+    if self._stop is not None:
+      self._last_rects = None
+      self._update()
+
+  def _get_options(self):
+    # middleware is built once and reused for every update
+    if self._options is None:
+      middleware = [
+        FloatingUIDOM.offset(self._offset),
+        FloatingUIDOM.flip(),
+        FloatingUIDOM.shift(self._shift),
+        FloatingUIDOM.hide(self._hide),
+        FloatingUIDOM.size(size_middleware()),
+      ]
+      if self._arrow:
+        middleware.append(FloatingUIDOM.arrow({"element": self._arrow}))
+
+      self._options = {
+        'placement': self._placement,
+        'strategy': self._strategy,
         'middleware': middleware,
-      },
+      }
+    return self._options
+
+  def _start(self):
+    if self._stop is None:
+      self._last_rects = None
+      self._stop = FloatingUIDOM.autoUpdate(
+        self.reference_el, self.floating_el, self._on_change
+      )
+
+  def _on_change(self, *args):
+    if self._last_rects is None:
+      self._update()
+    elif not self._frame_requested:
+      # scroll and resize can fire many times a frame, only position once
+      self._frame_requested = True
+      requestAnimationFrame(self._on_frame)
+
+  def _on_frame(self, *args):
+    self._frame_requested = False
+    if self._stop is not None:
+      self._update()
+
+  def _get_rects(self):
+    rect = self.reference_el.getBoundingClientRect()
+    floating_el = self.floating_el
+    return (
+      rect.x,
+      rect.y,
+      rect.width,
+      rect.height,
+      floating_el.offsetWidth,
+      floating_el.offsetHeight,
+      window.innerWidth,
+      window.innerHeight,
+    )
+
+  def _update(self):
+    rects = self._get_rects()
+    if rects == self._last_rects:
+      return
+    self._last_rects = rects
+
+    floating_el = self.floating_el
+    arrow = self._arrow
+    rv = FloatingUIDOM.computePosition(
+      self.reference_el, floating_el, self._get_options()
     )
     floating_el.style.left = f"{rv.x}px"
     floating_el.style.top = f"{rv.y}px"
@@ -67,7 +201,7 @@ def auto_update(
     if arrow and "arrow" in middlewareData:
       x = middlewareData.arrow.get("x")
       y = middlewareData.arrow.get("y")
-      static_side = _static_arrow_position.get(placement.split("-")[0])
+      static_side = _static_arrow_position.get(self._placement.split("-")[0])
       arrow.style.left = "" if x is None else f"{x}px"
       arrow.style.top = "" if y is None else f"{y}px"
       arrow.style.right = ""
@@ -76,7 +210,36 @@ def auto_update(
         # assumes the arrow element is 8px 8px
         arrow.style[static_side] = "-4px"
 
-  return FloatingUIDOM.autoUpdate(reference_el, floating_el, update)
+
+def register(
+  reference_el,
+  floating_el,
+  *,
+  placement="bottom",
+  strategy="absolute",
+  offset=6,
+  shift={"padding": 5},
+  hide={"padding": 15},
+  arrow=None,
+):
+  """returns a closed FloatingElement for the floating and reference elements
+  call open() when the floating element is shown and close() when it is hidden
+  (and in x-anvil-page-removed)
+  if using arrow, arrow should be an HTMLElement"""
+  return FloatingElement(
+    reference_el, floating_el, placement, strategy, offset, shift, hide, arrow
+  )
+
+
+def auto_update(reference_el, floating_el, **options):
+  """starts auto updating position of floating element to a reference element
+  returns a cleanup function
+  takes the same options as register
+  call this function in x-anvil-page-added
+  call the cleanup in x-anvil-page-removed"""
+  floating = register(reference_el, floating_el, **options)
+  floating.open()
+  return floating.close
 
 
 def size_middleware():
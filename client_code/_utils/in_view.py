@@ -0,0 +1,68 @@
+import anvil.js
+from anvil.js.window import IntersectionObserver, WeakMap, document
+
+# Tracks whether elements can be seen, for pausing work nobody can see.
+# One IntersectionObserver is shared by every watched element and a single
+# visibilitychange listener covers the page being hidden (e.g. a background tab).
+# Callbacks are called with True or False whenever that changes.
+
+_observer = None
+_ids = None
+_watched = {}  # id -> [callback, intersecting, visible]
+_next_id = 0
+
+
+def watch(element, callback):
+  """Calls callback(visible) when element scrolls in or out of view, is hidden
+  or shown, or the page itself is hidden or shown."""
+  global _observer, _ids, _next_id
+  if _observer is None:
+    _observer = IntersectionObserver(_on_intersection)
+    _ids = anvil.js.new(WeakMap)
+    document.addEventListener("visibilitychange", _on_visibility_change)
+  element_id = _ids.get(element)
+  if element_id is None:
+    _next_id += 1
+    element_id = _next_id
+    _ids.set(element, element_id)
+  # assume visible until the observer reports otherwise
+  _watched[element_id] = [callback, True, True]
+  _observer.observe(element)
+
+
+def unwatch(element):
+  global _observer, _ids
+  if _observer is None:
+    return
+  element_id = _ids.get(element)
+  if element_id is None:
+    return
+  _ids.delete(element)
+  _watched.pop(element_id, None)
+  _observer.unobserve(element)
+  if not _watched:
+    _observer.disconnect()
+    _observer = None
+    _ids = None
+    document.removeEventListener("visibilitychange", _on_visibility_change)
+
+
+def _update(watched):
+  callback, intersecting, visible = watched
+  now_visible = intersecting and not document.hidden
+  if now_visible != visible:
+    watched[2] = now_visible
+    callback(now_visible)
+
+
+def _on_intersection(entries, observer):
+  for entry in entries:
+    watched = _watched.get(_ids.get(entry.target))
+    if watched is not None:
+      watched[1] = entry.isIntersecting
+      _update(watched)
+
+
+def _on_visibility_change(event):
+  for watched in list(_watched.values()):
+    _update(watched)
@@ -0,0 +1,122 @@
+import anvil
+from anvil.js.window import location
+
+# Tracks the selected NavigationLink within a group of links.
+# Layouts own the group for the links in their navigation slot; links that aren't
+# in a layout share a group with the other links in the same container. Those
+# groups are kept here rather than on the container, and are dropped once their
+# last link has left the page.
+# Changing the selection only touches the old and the new link, and links are
+# indexed by target so the active one can be found from the open form or URL hash.
+
+_container_groups = {}  # container -> group, for links outside a layout
+
+
+class NavigationGroup:
+  def __init__(self, container=None):
+    self._container = container
+    self._links = {}
+    self._selected = None
+    # navigate_to or url -> first link with that target, built on demand
+    self._target_index = None
+
+  @property
+  def links(self):
+    return list(self._links)
+
+  @property
+  def selected(self):
+    return self._selected
+
+  def _add_link(self, link):
+    self._links[link] = None
+    self._target_index = None
+    if is_current(link):
+      self._select(link)
+    elif link.selected:
+      # e.g. a kept-alive form returning with the link that navigated away from it
+      selected = self._selected
+      if selected is not None and is_current(selected):
+        link.selected = False
+      else:
+        self._select(link)
+
+  def _remove_link(self, link):
+    self._links.pop(link, None)
+    self._target_index = None
+    if self._selected is link:
+      self._selected = None
+    if not self._links and self._container is not None:
+      _container_groups.pop(self._container, None)
+
+  def _invalidate_targets(self):
+    self._target_index = None
+
+  def _select(self, link):
+    # the link's setter skips unchanged values, so record the selection here too
+    self._set_selected(link)
+    link.selected = True
+
+  def _set_selected(self, link):
+    previous = self._selected
+    self._selected = link
+    if previous is not None and previous is not link:
+      previous.selected = False
+
+  def _set_deselected(self, link):
+    if self._selected is link:
+      self._selected = None
+
+  def _get_link_for_target(self, target):
+    index = self._target_index
+    if index is None:
+      index = self._target_index = {}
+      for link in self._links:
+        for link_target in (link.navigate_to, link.url):
+          if isinstance(link_target, str) and link_target:
+            index.setdefault(link_target, link)
+    return index.get(target)
+
+  def sync(self):
+    """Selects the link for the open form, or failing that the URL hash.
+    This replaces whichever link was selected before."""
+    link = self._get_link_for_target(get_form_name(anvil.get_open_form()))
+    if link is None and location.hash:
+      link = self._get_link_for_target(location.hash)
+    if link is not None:
+      self._select(link)
+
+
+def get_form_name(form):
+  """Returns the name that navigate_to would use to open form, e.g. "Pages.Home"."""
+  if form is None:
+    return None
+  parts = type(form).__module__.split(".", 1)
+  return parts[-1]
+
+
+def is_current(link):
+  target = link.navigate_to
+  if isinstance(target, str) and target:
+    return target == get_form_name(anvil.get_open_form())
+  url = link.url
+  return isinstance(url, str) and url.startswith("#") and url == location.hash
+
+
+def get_group(link):
+  """Returns the group that link belongs to: the one owned by its nearest ancestor
+  with a navigation group, or else a new one shared with the links next to it."""
+  component = link.parent
+  while component is not None:
+    group = _container_groups.get(component)
+    if group is None:
+      group = getattr(component, "_navigation_group", None)
+    if group is not None:
+      return group
+    component = component.parent
+
+  parent = link.parent
+  if parent is None:
+    return None
+  group = _container_groups[parent] = NavigationGroup(parent)
+  return group
@@ -0,0 +1,93 @@
+from anvil.js.window import window
+
+from . import form_cache
+
+# Builds navigation targets ahead of time, while the browser is idle.
+# Requests are queued and at most one form is built per idle callback, and only
+# when there is enough idle time left, so prefetching doesn't compete with user
+# input. A form's constructor can't be split up, so IDLE_BUDGET_MS is the idle
+# time needed to start a build, not a limit on how long the build takes.
+# Requests are counted per owner (e.g. a NavigationLink), and a form is only
+# dropped from the queue once every owner that asked for it has cancelled.
+
+IDLE_BUDGET_MS = 10  # idle time needed before starting to build a form
+HOVER_INTENT_MS = 150  # how long the pointer rests on a link before prefetching
+
+_queue = {}  # form name -> set of owners, in the order they were requested
+_idle_handle = None
+_preload_hook = None
+_request_idle = getattr(window, "requestIdleCallback", None)
+
+
+def set_preload_hook(fn):
+  """Sets a function called with each prefetched form, e.g. to start loading its
+  data. Pass None to remove it."""
+  global _preload_hook
+  _preload_hook = fn
+
+
+def request(form_name, owner):
+  """Builds the named form the next time the browser is idle."""
+  if form_name is None or form_cache.is_ready(form_name):
+    return
+  if form_name not in _queue and not form_cache.can_prefetch():
+    return
+  _queue.setdefault(form_name, set()).add(owner)
+  _schedule()
+
+
+def cancel(form_name, owner):
+  """Withdraws owner's request. The form is forgotten, if it hasn't been built yet,
+  once no owners are waiting for it."""
+  global _idle_handle
+  owners = _queue.get(form_name)
+  if owners is not None:
+    owners.discard(owner)
+    if not owners:
+      del _queue[form_name]
+  if not _queue and _idle_handle is not None:
+    _cancel_idle(_idle_handle)
+    _idle_handle = None
+
+
+def _schedule():
+  global _idle_handle
+  if _idle_handle is not None:
+    return
+  if _request_idle is not None:
+    _idle_handle = _request_idle(_on_idle)
+  else:
+    _idle_handle = window.setTimeout(_on_idle, 1)
+
+
+def _cancel_idle(handle):
+  if _request_idle is not None:
+    window.cancelIdleCallback(handle)
+  else:
+    window.clearTimeout(handle)
+
+
+def _time_remaining(deadline):
+  if deadline is None:
+    return IDLE_BUDGET_MS
+  return deadline.timeRemaining()
+
+
+def _on_idle(deadline=None):
+  global _idle_handle
+  _idle_handle = None
+  if not form_cache.can_prefetch():
+    # nothing more is built until a prefetched form has been opened
+    _queue.clear()
+    return
+  if _queue and _time_remaining(deadline) >= IDLE_BUDGET_MS:
+    form_name = next(iter(_queue))
+    del _queue[form_name]
+    try:
+      form_cache.prefetch(form_name, _preload_hook)
+    finally:
+      # keep working through the queue even if something unexpected went wrong
+      if _queue:
+        _schedule()
+  elif _queue:
+    _schedule()
@@ -0,0 +1,57 @@
+from anvil.js.window import requestAnimationFrame
+
+# Drives the progress property of bound indicators from source functions.
+# Each source is called at most once per animation frame, however many
+# indicators it is bound to, and every indicator is updated in the same pass.
+# The frame loop only runs while something is bound.
+# A source that raises is unbound from its indicators and the error is raised once.
+
+_FAILED = object()
+
+_bindings = {}
+_frame_requested = False
+
+
+def bind(component, source):
+  """Sets component.progress to source() on every animation frame."""
+  _bindings[component] = source
+  _request_frame()
+
+
+def unbind(component):
+  _bindings.pop(component, None)
+
+
+def _on_frame(*args):
+  global _frame_requested
+  _frame_requested = False
+  samples = {}
+  error = None
+  for component, source in list(_bindings.items()):
+    if source in samples:
+      value = samples[source]
+    else:
+      try:
+        value = source()
+      except Exception as e:
+        # stop calling a failing source rather than failing on every frame
+        value = _FAILED
+        if error is None:
+          error = e
+      samples[source] = value
+    if value is _FAILED:
+      unbind(component)
+    else:
+      component.progress = value
+  if _bindings:
+    _request_frame()
+  if error is not None:
+    raise error
+
+
+def _request_frame():
+  global _frame_requested
+  if _frame_requested:
+    return
+  _frame_requested = True
+  requestAnimationFrame(_on_frame)
@@ -1,6 +1,5 @@
 import anvil.designer
 from anvil import *
-from anvil.js.window import document
 from anvil.property_utils import (
   get_margin_styles,
   get_padding_styles,
@@ -14,7 +13,8 @@ from anvil.property_utils import (
   set_element_spacing,
 )
 
-from . import fui, noop
+from . import tooltip
+from .scheduler import write, write_style
 
 _directions = ("Top", "Right", "Bottom", "Left")
 
@@ -35,17 +35,74 @@ def theme_color_to_css(color: str):
 """ REUSABLE PROPERTIES """
 
 
-def property_with_callback(prop, cb, default_value=None):
+# Change detection policies for property_with_callback.
+# IDENTITY skips the callback if the new value is the value last applied,
+# EQUALITY skips it if the new value compares equal to the value last applied,
+# ALWAYS never skips it.
+IDENTITY = "identity"
+EQUALITY = "equality"
+ALWAYS = "always"
+
+_set_stats = {}
+
+
+def _is_unchanged(compare, old, new):
+  if compare == ALWAYS:
+    return False
+  if compare == IDENTITY:
+    return old is new
+  if isinstance(new, (list, dict)):
+    # these may have been mutated in place, so assigning them always applies
+    return False
+  return type(old) is type(new) and old == new
+
+
+def _get_set_stats(cls):
+  stats = _set_stats.get(cls)
+  if stats is None:
+    stats = _set_stats[cls] = {"applied": 0, "elided": 0}
+  return stats
+
+
+def get_property_set_stats():
+  """Returns the number of applied and elided property sets for each component class"""
+  return {cls.__name__: dict(stats) for cls, stats in _set_stats.items()}
+
+
+def reset_property_set_stats():
+  _set_stats.clear()
+
+
+def property_with_callback(prop, cb, default_value=None, compare=EQUALITY):
   def getter(self):
     return self._props.get(prop, default_value)
 
   def setter(self, value):
     self._props[prop] = value
+    stats = _get_set_stats(type(self))
+    applied = getattr(self, '_applied_props', None)
+    if applied is None:
+      applied = self._applied_props = {}
+    elif prop in applied and _is_unchanged(compare, applied[prop], value):
+      stats["elided"] += 1
+      return
+    stats["applied"] += 1
     cb(self, value)
+    applied[prop] = value
 
   return property(getter, setter)
 
 
+def init_unset_properties(component, properties, names):
+  """Runs the setters of properties that weren't passed to init_components.
+  Module component properties don't get their default values applied by
+  init_components, so call this once after it. List names in the order the
+  setters depend on each other."""
+  for name in names:
+    if name not in properties:
+      setattr(component, name, getattr(component, name))
+
+
 def property_without_callback(prop, default_value=None):
   def getter(self):
     return self._props.get(prop, default_value)
@@ -60,14 +117,14 @@ def color_property(dom_node_name, style_prop, prop_name, default_value=None):
   def set_color(self, value):
     if value:
       value = theme_color_to_css(value)
-    self.dom_nodes[dom_node_name].style[style_prop] = value
+    write_style(self, dom_node_name, style_prop, value)
 
   return property_with_callback(prop_name, set_color, default_value)
 
 
 def style_property(dom_node_name, style_prop, prop_name):
   def set_style(self, value):
-    self.dom_nodes[dom_node_name].style[style_prop] = value
+    write_style(self, dom_node_name, style_prop, value)
 
   return property_with_callback(prop_name, set_style)
 
@@ -126,20 +183,16 @@ def value_property(dom_node_name, prop_name="value"):
 
 def underline_property(dom_node_name, prop_name="underline"):
   def set_underline(self, value):
-    if value:
-      self.dom_nodes[dom_node_name].style.textDecoration = 'underline'
-    else:
-      self.dom_nodes[dom_node_name].style.textDecoration = 'none'
+    write_style(
+      self, dom_node_name, 'textDecoration', 'underline' if value else 'none'
+    )
 
   return property_with_callback(prop_name, set_underline)
 
 
 def italic_property(dom_node_name, prop_name="italic"):
   def set_italic(self, value):
-    if value:
-      self.dom_nodes[dom_node_name].style.fontStyle = 'italic'
-    else:
-      self.dom_nodes[dom_node_name].style.fontStyle = 'normal'
+    write_style(self, dom_node_name, 'fontStyle', 'italic' if value else 'normal')
 
   return property_with_callback(prop_name, set_italic)
 
@@ -150,10 +203,7 @@ def bold_property(dom_node_name, prop_name="bold"):
 
 def custom_bold_property(dom_node_name, prop_name="bold", custom_bold=500):
   def set_bold(self, value):
-    if value:
-      self.dom_nodes[dom_node_name].style.fontWeight = custom_bold
-    else:
-      self.dom_nodes[dom_node_name].style.fontWeight = 'normal'
+    write_style(self, dom_node_name, 'fontWeight', custom_bold if value else 'normal')
 
   return property_with_callback(prop_name, set_bold)
 
@@ -163,42 +213,42 @@ def font_size_property(dom_node_name, prop_name="font_size"):
     self._font_size = value
     if value:
       value = f'{value}px'
-    self.dom_nodes[dom_node_name].style.fontSize = value
+    write_style(self, dom_node_name, 'fontSize', value)
 
   return property_with_callback(prop_name, set_font_size)
 
 
 def font_family_property(dom_node_name, prop_name="font_family"):
   def set_font_family(self, value):
-    self.dom_nodes[dom_node_name].style.fontFamily = value
+    write_style(self, dom_node_name, 'fontFamily', value)
 
   return property_with_callback(prop_name, set_font_family)
 
 
 def border_property(dom_node_name, prop_name="border"):
   def set_border(self, value):
-    self.dom_nodes[dom_node_name].style.border = value
+    write_style(self, dom_node_name, 'border', value)
 
   return property_with_callback(prop_name, set_border)
 
 
 def margin_property(dom_node_name, prop_name="margin"):
   def set_margin(self, value):
-    set_element_margin(self.dom_nodes[dom_node_name], value)
+    write(self, dom_node_name, 'margin', set_element_margin, value)
 
   return property_with_callback(prop_name, set_margin)
 
 
 def spacing_property(dom_node_name, prop_name="spacing"):
   def set_spacing(self, value):
-    set_element_spacing(self.dom_nodes[dom_node_name], value)
+    write(self, dom_node_name, 'spacing', set_element_spacing, value)
 
   return property_with_callback(prop_name, set_spacing)
 
 
 def padding_property(dom_node_name, prop_name="padding"):
   def set_padding(self, value):
-    set_element_padding(self.dom_nodes[dom_node_name], value)
+    write(self, dom_node_name, 'padding', set_element_padding, value)
 
   return property_with_callback(prop_name, set_padding)
 
@@ -223,42 +273,10 @@ def role_property(dom_node_name, prop_name="role"):
 
 
 def tooltip_property(dom_node_name, prop_name="tooltip"):
-  # To use this property, add self._tooltip_node = None to the init of your component
   def set_tooltip(self, value):
     if anvil.designer.in_designer:
       return
-
-    self._cleanup = noop
-    reference_element = self.dom_nodes[dom_node_name]
-    if value:
-      self._tooltip_node = document.createElement('div')
-      self._tooltip_node.innerText = value
-      self._tooltip_node.classList.add('anvil-m3-tooltip')
-      document.body.append(self._tooltip_node)
-      self.reference_element = self.dom_nodes[dom_node_name]
-
-      def show_tooltip(e):
-        self._tooltip_node.style.opacity = 1
-
-      def hide_tooltip(e):
-        self._tooltip_node.style.opacity = 0
-
-      tooltip_events = {
-        'mouseenter': show_tooltip,
-        'mouseleave': hide_tooltip,
-        'focus': show_tooltip,
-        'blur': hide_tooltip,
-      }
-      for event, listener in tooltip_events.items():
-        reference_element.addEventListener(event, listener)
-      self._cleanup = fui.auto_update(
-        reference_element, self._tooltip_node, placement="bottom-start"
-      )
-    else:
-      if self._tooltip_node:
-        self._tooltip_node.remove()
-        self._cleanup()
-        self._cleanup = noop
+    tooltip.set_tooltip(self.dom_nodes[dom_node_name], value)
 
   return property_with_callback(prop_name, set_tooltip)
 
@@ -282,11 +300,18 @@ def anvil_prop(*args, **kwargs):
     @anvil_prop(default_value=42)
     def my_property(new_value):
       ...
+
+  The decorator also takes a compare kwarg (IDENTITY, EQUALITY or ALWAYS)
+  which decides when setting an unchanged value skips the setter:
+
+    @anvil_prop(compare=ALWAYS)
+    def my_property(new_value):
+      ...
   """
 
-  def get_decorator(default_value=None):
+  def get_decorator(default_value=None, compare=EQUALITY):
     return lambda fn: property_with_callback(
-      fn.__name__, fn, default_value=default_value
+      fn.__name__, fn, default_value=default_value, compare=compare
     )
 
   if len(args) > 0 and isinstance(args[0], str):
@@ -294,7 +319,9 @@ def anvil_prop(*args, **kwargs):
     return property_without_callback(args[0], default_value=kwargs.get("default_value"))
   elif len(args) == 0:
     # We have been used as a decorator with kwargs
-    return get_decorator(kwargs.get("default_value"))
+    return get_decorator(
+      kwargs.get("default_value"), kwargs.get("compare", EQUALITY)
+    )
   else:
     # We have been called as a plain decorator, with no args/kwargs
     return get_decorator()(args[0])
@@ -0,0 +1,57 @@
+import anvil.js
+from anvil.js.window import ResizeObserver, WeakMap
+
+# One ResizeObserver shared by every component.
+# Each observed element gets an id, stored against the element in a WeakMap,
+# which maps entries back to the component callback. A callback is called once
+# per batch of entries, with the latest entry for its element.
+
+_observer = None
+_ids = None
+_callbacks = {}
+_next_id = 0
+
+
+def observe(element, callback):
+  """Calls callback(entry) whenever element is resized.
+  Observing an element again replaces its callback."""
+  global _observer, _ids, _next_id
+  if _observer is None:
+    _observer = ResizeObserver(_on_resize)
+    _ids = anvil.js.new(WeakMap)
+  element_id = _ids.get(element)
+  if element_id is None:
+    _next_id += 1
+    element_id = _next_id
+    _ids.set(element, element_id)
+  _callbacks[element_id] = callback
+  _observer.observe(element)
+
+
+def unobserve(element):
+  """Stops observing element. The observer disconnects once nothing is left."""
+  global _observer, _ids
+  if _observer is None:
+    return
+  element_id = _ids.get(element)
+  if element_id is None:
+    return
+  _ids.delete(element)
+  _callbacks.pop(element_id, None)
+  _observer.unobserve(element)
+  if not _callbacks:
+    _observer.disconnect()
+    _observer = None
+    _ids = None
+
+
+def _on_resize(entries, observer):
+  latest = {}
+  for entry in entries:
+    element_id = _ids.get(entry.target)
+    if element_id is not None:
+      latest[element_id] = entry
+  for element_id, entry in latest.items():
+    callback = _callbacks.get(element_id)
+    if callback is not None:
+      callback(entry)
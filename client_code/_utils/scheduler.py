@@ -0,0 +1,84 @@
+import anvil.designer
+from anvil.js.window import requestAnimationFrame
+
+# Opt-in batching for the DOM writes made by the reusable properties.
+# When enabled, writes are queued per element and applied together on the next
+# animation frame. Writes to the same (element, key) overwrite each other so only
+# the last value is ever applied.
+
+_enabled = False
+_frame_requested = False
+_pending = {}
+
+
+def enable_batching(value=True):
+  """Queue property DOM writes until the next animation frame.
+  Disabling batching flushes anything that is still queued."""
+  global _enabled
+  _enabled = value
+  if not value:
+    flush()
+
+
+def batching_enabled():
+  return _enabled
+
+
+def write(component, dom_node_name, key, fn, value):
+  """Calls fn(element, value) for the named dom node of component.
+  If batching is enabled the call is deferred to the next animation frame
+  and replaces any earlier write queued with the same key for that element."""
+  if not _enabled or anvil.designer.in_designer:
+    fn(component.dom_nodes[dom_node_name], value)
+    return
+
+  writes = _pending.get((component, dom_node_name))
+  if writes is None:
+    writes = _pending[(component, dom_node_name)] = {}
+  writes[key] = (fn, value)
+  _request_frame()
+
+
+def _set_style(style_prop):
+  def set_style(element, value):
+    element.style[style_prop] = value
+
+  return set_style
+
+
+_style_setters = {}
+
+
+def write_style(component, dom_node_name, style_prop, value):
+  fn = _style_setters.get(style_prop)
+  if fn is None:
+    fn = _style_setters[style_prop] = _set_style(style_prop)
+  write(component, dom_node_name, style_prop, fn, value)
+
+
+def flush():
+  """Apply all queued writes now.
+  Call this before reading layout that depends on recently set properties."""
+  global _pending
+  if not _pending:
+    return
+  pending = _pending
+  _pending = {}
+  for (component, dom_node_name), writes in pending.items():
+    element = component.dom_nodes[dom_node_name]
+    for fn, value in writes.values():
+      fn(element, value)
+
+
+def _on_frame(*args):
+  global _frame_requested
+  _frame_requested = False
+  flush()
+
+
+def _request_frame():
+  global _frame_requested
+  if _frame_requested:
+    return
+  _frame_requested = True
+  requestAnimationFrame(_on_frame)
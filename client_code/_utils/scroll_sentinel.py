@@ -0,0 +1,28 @@
+from anvil.js.window import IntersectionObserver, document
+
+# Detects the page being scrolled away from the top without a scroll listener.
+# A 1px sentinel sits at the very top of the document and an IntersectionObserver
+# reports when it leaves or re-enters the viewport, so no Python runs while
+# scrolling, only when the scrolled state changes.
+
+
+def track_scrolled(element, class_name="anvil-m3-scrolled"):
+  """Adds class_name to element while the page is scrolled away from the top.
+  Returns a function that stops tracking."""
+  sentinel = document.createElement("div")
+  sentinel.className = "anvil-m3-scroll-sentinel"
+  sentinel.setAttribute("aria-hidden", "true")
+  document.body.prepend(sentinel)
+
+  def on_intersection(entries, observer):
+    element.classList.toggle(class_name, not entries[-1].isIntersecting)
+
+  observer = IntersectionObserver(on_intersection)
+  observer.observe(sentinel)
+
+  def stop():
+    observer.disconnect()
+    sentinel.remove()
+    element.classList.remove(class_name)
+
+  return stop
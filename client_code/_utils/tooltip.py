@@ -0,0 +1,145 @@
+from anvil.js.window import document, window
+
+from . import fui, noop
+
+# A single tooltip shared by every component with a tooltip property.
+# Reference elements are marked with a data attribute holding the tooltip text.
+# Document level listeners pick up hover and focus on marked elements and the one
+# floating node is only positioned while it is visible.
+
+_ATTR = "data-anvil-m3-tooltip"
+_SELECTOR = f"[{_ATTR}]"
+
+SHOW_DELAY = 500  # ms of hover before a tooltip is shown
+SWAP_DELAY = 100  # ms before moving an already visible tooltip to a new element
+HIDE_DELAY = 100  # ms grace period before hiding, so moving between elements is smooth
+
+_node = None
+_reference = None
+_visible = False
+_listening = False
+_show_timeout = None
+_hide_timeout = None
+_cleanup = noop
+
+
+def set_tooltip(element, text):
+  """Sets (or removes, if text is falsy) the tooltip text for element."""
+  if text:
+    element.setAttribute(_ATTR, text)
+    _listen()
+    if _visible and _is_reference(element):
+      _node.innerText = text
+  else:
+    element.removeAttribute(_ATTR)
+    if _is_reference(element):
+      _hide()
+
+
+def _listen():
+  global _listening
+  if _listening:
+    return
+  _listening = True
+  document.addEventListener("mouseover", _on_enter)
+  document.addEventListener("focusin", _on_enter)
+  document.addEventListener("mouseout", _on_leave)
+  document.addEventListener("focusout", _on_leave)
+
+
+def _get_node():
+  global _node
+  if _node is None:
+    _node = document.createElement("div")
+    _node.classList.add("anvil-m3-tooltip")
+    document.body.append(_node)
+  return _node
+
+
+def _is_reference(element):
+  return _reference is not None and _reference.isSameNode(element)
+
+
+def _find_reference(target):
+  closest = getattr(target, "closest", None)
+  if closest is None:
+    return None
+  return closest(_SELECTOR)
+
+
+def _cancel_show():
+  global _show_timeout
+  if _show_timeout is not None:
+    window.clearTimeout(_show_timeout)
+    _show_timeout = None
+
+
+def _cancel_hide():
+  global _hide_timeout
+  if _hide_timeout is not None:
+    window.clearTimeout(_hide_timeout)
+    _hide_timeout = None
+
+
+def _clear_timeouts():
+  _cancel_show()
+  _cancel_hide()
+
+
+def _on_enter(event):
+  global _reference, _show_timeout
+  reference = _find_reference(event.target)
+  if reference is None:
+    return
+  if _is_reference(reference):
+    # moving within the current element, or back onto it before it was hidden
+    _cancel_hide()
+    if not _visible and _show_timeout is None:
+      _show_timeout = window.setTimeout(_show, SHOW_DELAY)
+    return
+
+  _clear_timeouts()
+  _reference = reference
+  _show_timeout = window.setTimeout(_show, SWAP_DELAY if _visible else SHOW_DELAY)
+
+
+def _on_leave(event):
+  global _hide_timeout
+  if _reference is None:
+    return
+  related = event.relatedTarget
+  if related is not None and _reference.contains(related):
+    return
+  _clear_timeouts()
+  _hide_timeout = window.setTimeout(_hide, HIDE_DELAY)
+
+
+def _show(*args):
+  global _visible, _cleanup, _show_timeout
+  _show_timeout = None
+  reference = _reference
+  if reference is None or not reference.isConnected:
+    _hide()
+    return
+  text = reference.getAttribute(_ATTR)
+  if not text:
+    _hide()
+    return
+
+  node = _get_node()
+  node.innerText = text
+  _cleanup()
+  _cleanup = fui.auto_update(reference, node, placement="bottom-start")
+  node.style.opacity = 1
+  _visible = True
+
+
+def _hide(*args):
+  global _reference, _visible, _cleanup
+  _clear_timeouts()
+  _reference = None
+  if _visible:
+    _node.style.opacity = 0
+    _visible = False
+  _cleanup()
+  _cleanup = noop